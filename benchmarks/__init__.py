@@ -0,0 +1,3 @@
+"""
+Benchmarks of paris and of the dendrogram slicers. Run them with ``python -m benchmarks.run``.
+"""
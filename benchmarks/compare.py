@@ -0,0 +1,66 @@
+"""
+Compare two benchmark reports written by benchmarks.run on the same machine.
+
+    $ python -m benchmarks.compare before.json after.json --threshold 1.1
+"""
+import argparse
+import json
+import sys
+
+
+def compare(before, after):
+    """
+     Match the results of two benchmark reports.
+
+     Parameters
+     ----------
+     before: dict
+         Reference report.
+     after: dict
+         New report.
+
+     Returns
+     -------
+     rows: list of tuple
+         For each (graph, number of nodes, function) present in both reports, the times and peak memories before and
+         after, and the ratio of the times.
+     """
+    key = lambda r: (r['graph'], r['n_nodes'], r['function'])
+    reference = {key(r): r for r in before['results']}
+    rows = []
+    for r in after['results']:
+        if key(r) in reference:
+            old = reference[key(r)]
+            ratio = r['time'] / old['time'] if old['time'] > 0 else float('inf')
+            rows.append(key(r) + (old['time'], r['time'], old['peak_memory'], r['peak_memory'], ratio))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare two benchmark reports.')
+    parser.add_argument('before')
+    parser.add_argument('after')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='time ratio above which a result is reported as a regression')
+    args = parser.parse_args(argv)
+
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    if before.get('platform') != after.get('platform'):
+        sys.stderr.write('warning: the reports come from different machines\n')
+
+    regressions = 0
+    for graph, n_nodes, function, old_time, new_time, old_memory, new_memory, ratio in compare(before, after):
+        flag = ''
+        if ratio > args.threshold:
+            flag = '  REGRESSION'
+            regressions += 1
+        print('{:<12}{:>10}  {:<36}{:>10.4f} s{:>10.4f} s{:>8.2f}x{:>10.1f} MB{:>10.1f} MB{}'.format(
+            graph, n_nodes, function, old_time, new_time, ratio, old_memory / 1e6, new_memory / 1e6, flag))
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,147 @@
+import numpy as np
+import networkx as nx
+
+
+def sbm_graph(n_nodes, n_blocks=10, average_degree=10., mixing=0.1, seed=0):
+    """
+     Generate a stochastic block model graph with blocks of equal size.
+
+     Parameters
+     ----------
+     n_nodes: int
+         Number of nodes.
+     n_blocks: int
+         Number of blocks.
+     average_degree: double
+         Expected degree of the nodes.
+     mixing: double
+         Expected fraction of the edges of a node that leave its block.
+     seed: int
+         Seed of the random generator.
+
+     Returns
+     -------
+     graph: networkx.Graph
+         The generated graph.
+     """
+    sizes = [n_nodes // n_blocks + (1 if b < n_nodes % n_blocks else 0) for b in range(n_blocks)]
+    block_size = float(n_nodes) / n_blocks
+    p_in = min(1., average_degree * (1 - mixing) / max(block_size - 1, 1))
+    p_out = min(1., average_degree * mixing / max(n_nodes - block_size, 1))
+    p = [[p_in if a == b else p_out for b in range(n_blocks)] for a in range(n_blocks)]
+    return nx.Graph(nx.stochastic_block_model(sizes, p, seed=seed))
+
+
+def lfr_like_graph(n_nodes, average_degree=10., mixing=0.2, degree_exponent=2.5, community_exponent=1.5,
+                   seed=0):
+    """
+     Generate a graph with power-law degrees and power-law community sizes, in the spirit of the LFR benchmark. Each
+     stub of a node is paired inside its community with probability 1 - mixing and with any node otherwise.
+
+     Parameters
+     ----------
+     n_nodes: int
+         Number of nodes.
+     average_degree: double
+         Approximate average degree of the nodes.
+     mixing: double
+         Expected fraction of the edges of a node that leave its community.
+     degree_exponent: double
+         Exponent of the power-law distribution of the degrees.
+     community_exponent: double
+         Exponent of the power-law distribution of the community sizes.
+     seed: int
+         Seed of the random generator.
+
+     Returns
+     -------
+     graph: networkx.Graph
+         The generated graph, without self-loops and multiple edges.
+     """
+    random = np.random.RandomState(seed)
+    degrees = random.pareto(degree_exponent - 1, n_nodes) + 1
+    degrees = np.maximum(1, np.round(degrees * average_degree / np.mean(degrees))).astype(int)
+
+    sizes = []
+    while sum(sizes) < n_nodes:
+        sizes.append(int(min(n_nodes - sum(sizes), 10 * (random.pareto(community_exponent - 1) + 1))))
+    communities = np.repeat(np.arange(len(sizes)), sizes)
+    random.shuffle(communities)
+
+    internal = random.binomial(degrees, 1 - mixing)
+    edges = []
+    for c in range(len(sizes)):
+        stubs = np.repeat(np.where(communities == c)[0], internal[communities == c])
+        random.shuffle(stubs)
+        edges.append(stubs[:len(stubs) // 2 * 2].reshape(-1, 2))
+    stubs = np.repeat(np.arange(n_nodes), degrees - internal)
+    random.shuffle(stubs)
+    edges.append(stubs[:len(stubs) // 2 * 2].reshape(-1, 2))
+
+    graph = nx.Graph()
+    graph.add_nodes_from(range(n_nodes))
+    graph.add_edges_from(np.concatenate(edges).tolist())
+    graph.remove_edges_from(list(nx.selfloop_edges(graph)))
+    return graph
+
+
+def power_law_graph(n_nodes, average_degree=10., seed=0):
+    """
+     Generate a preferential attachment graph with power-law degrees and clustering.
+
+     Parameters
+     ----------
+     n_nodes: int
+         Number of nodes.
+     average_degree: double
+         Approximate average degree of the nodes.
+     seed: int
+         Seed of the random generator.
+
+     Returns
+     -------
+     graph: networkx.Graph
+         The generated graph.
+     """
+    return nx.powerlaw_cluster_graph(n_nodes, max(1, int(average_degree / 2)), 0.1, seed=seed)
+
+
+def components_graph(n_nodes, component_size=20, average_degree=4., seed=0):
+    """
+     Generate a graph made of many small random connected components.
+
+     Parameters
+     ----------
+     n_nodes: int
+         Number of nodes.
+     component_size: int
+         Number of nodes of each component.
+     average_degree: double
+         Approximate average degree of the nodes.
+     seed: int
+         Seed of the random generator.
+
+     Returns
+     -------
+     graph: networkx.Graph
+         The generated graph.
+     """
+    random = np.random.RandomState(seed)
+    graph = nx.Graph()
+    graph.add_nodes_from(range(n_nodes))
+    for start in range(0, n_nodes, component_size):
+        size = min(component_size, n_nodes - start)
+        nodes = list(range(start, start + size))
+        graph.add_edges_from(zip(nodes[:-1], nodes[1:]))
+        n_edges = int(size * average_degree / 2) - (size - 1)
+        if size > 1 and n_edges > 0:
+            u = random.randint(start, start + size, n_edges)
+            v = random.randint(start, start + size, n_edges)
+            graph.add_edges_from((int(a), int(b)) for a, b in zip(u, v) if a != b)
+    return graph
+
+
+GENERATORS = {'sbm': sbm_graph,
+              'lfr': lfr_like_graph,
+              'power_law': power_law_graph,
+              'components': components_graph}
@@ -0,0 +1,219 @@
+"""
+Time paris and the dendrogram slicers on synthetic graphs and write the results as JSON.
+
+    $ python -m benchmarks.run --sizes 1000 10000 --output results.json
+    $ python -m benchmarks.compare before.json after.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from functools import partial
+
+import numpy as np
+import networkx as nx
+
+from python_paris.paris import paris, paris_csr, reorder_dendrogram
+from python_paris.cluster_cut_slicer import *
+from python_paris.homogeneous_cut_slicer import *
+from python_paris.heterogeneous_cut_slicer import *
+from python_paris.distance_slicer import *
+from python_paris.resolution_slicer import resolution_sweep
+from benchmarks.graphs import GENERATORS
+
+
+class BenchmarkSetup:
+    """
+     The inputs of the benchmarked functions on a graph (adjacency, dendrogram, best cuts). Each input is computed on
+     first access and then shared by the cases, so that the cases filtered out of a run cost nothing.
+     """
+
+    def __init__(self, graph):
+        self.graph = graph
+        self._values = {}
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in SETUP:
+            raise AttributeError(name)
+        if name not in self._values:
+            self._values[name] = SETUP[name](self)
+        return self._values[name]
+
+
+def _adjacency(setup):
+    adjacency = nx.to_scipy_sparse_array(setup.graph, format='csr', dtype=float) \
+        if hasattr(nx, 'to_scipy_sparse_array') else nx.to_scipy_sparse_matrix(setup.graph, format='csr', dtype=float)
+    return adjacency.indptr, adjacency.indices, adjacency.data
+
+
+SETUP = {'adjacency': _adjacency,
+         'dendrogram': lambda setup: paris(setup.graph),
+         'shuffled': lambda setup: setup.dendrogram[np.random.RandomState(0).permutation(len(setup.dendrogram))],
+         'best_cluster': lambda setup: best_cluster_cut(setup.dendrogram)[0],
+         'best_homogeneous': lambda setup: best_homogeneous_cut(setup.dendrogram)[0],
+         'best_heterogeneous': lambda setup: best_heterogeneous_cut(setup.dendrogram)[0],
+         'best_distance': lambda setup: best_distance(setup.dendrogram)[0]}
+
+RESOLUTIONS = np.logspace(-3, 3, 100)
+
+CASES = [('paris', lambda s: partial(paris, s.graph)),
+         ('paris_csr', lambda s: partial(paris_csr, *s.adjacency)),
+         ('reorder_dendrogram', lambda s: partial(reorder_dendrogram, s.shuffled)),
+         ('best_cluster_cut', lambda s: partial(best_cluster_cut, s.dendrogram)),
+         ('ranking_cluster_cuts', lambda s: partial(ranking_cluster_cuts, s.dendrogram)),
+         # No cluster cut on graphs without a valid cluster (e.g. a single edge).
+         ('clustering_from_cluster_cut',
+          lambda s: partial(clustering_from_cluster_cut, s.dendrogram, s.best_cluster) if s.best_cluster >= 0
+          else None),
+         ('best_homogeneous_cut', lambda s: partial(best_homogeneous_cut, s.dendrogram)),
+         ('ranking_homogeneous_cuts', lambda s: partial(ranking_homogeneous_cuts, s.dendrogram)),
+         ('clustering_from_homogeneous_cut',
+          lambda s: partial(clustering_from_homogeneous_cut, s.dendrogram, s.best_homogeneous)),
+         ('best_heterogeneous_cut', lambda s: partial(best_heterogeneous_cut, s.dendrogram)),
+         ('ranking_heterogeneous_cuts', lambda s: partial(ranking_heterogeneous_cuts, s.dendrogram, 3)),
+         ('clustering_from_heterogeneous_cut',
+          lambda s: partial(clustering_from_heterogeneous_cut, s.dendrogram, s.best_heterogeneous)),
+         ('best_distance', lambda s: partial(best_distance, s.dendrogram)),
+         ('ranking_distances', lambda s: partial(ranking_distances, s.dendrogram)),
+         ('clustering_from_distance', lambda s: partial(clustering_from_distance, s.dendrogram, s.best_distance)),
+         ('resolution_sweep', lambda s: partial(resolution_sweep, s.dendrogram, *s.adjacency, RESOLUTIONS)),
+         ('modularity_homogeneous_cuts', lambda s: partial(modularity_homogeneous_cuts, s.dendrogram, *s.adjacency)),
+         ('conductance_cluster_cuts', lambda s: partial(conductance_cluster_cuts, s.dendrogram, *s.adjacency))]
+
+
+def benchmark_cases(graph, functions=None):
+    """
+     Build the functions to benchmark on a graph. Only the inputs of the selected functions are computed.
+
+     Parameters
+     ----------
+     graph: networkx.Graph
+         The benchmarked graph.
+     functions: list of str, optional
+         The names of the functions to benchmark (default: all).
+
+     Returns
+     -------
+     cases: list of (str, function)
+         The name of each benchmarked function and a function without arguments that calls it. The functions that do
+         not apply to the graph (e.g. clustering_from_cluster_cut without a valid cluster cut) are left out.
+     """
+    setup = BenchmarkSetup(graph)
+    cases = []
+    for function_name, prepare in CASES:
+        if functions is not None and function_name not in functions:
+            continue
+        function = prepare(setup)
+        if function is not None:
+            cases.append((function_name, function))
+    return cases
+
+
+def measure(function, repeat=3):
+    """
+     Measure the best wall time of a function over several runs, and its peak memory over one more run.
+
+     Parameters
+     ----------
+     function: function
+         Function without arguments.
+     repeat: int
+         Number of timed runs.
+
+     Returns
+     -------
+     time: double
+         Best wall time in seconds.
+     peak_memory: int
+         Peak memory allocated by the function in bytes, as traced by tracemalloc.
+     """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    function()
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times), peak_memory
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', 'HEAD'], stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(graph_names, sizes, repeat=3, functions=None, seed=0, log=sys.stderr):
+    """
+     Run the benchmarks.
+
+     Parameters
+     ----------
+     graph_names: list of str
+         Names of the graph generators, among the keys of benchmarks.graphs.GENERATORS.
+     sizes: list of int
+         Numbers of nodes of the generated graphs.
+     repeat: int
+         Number of timed runs of each function.
+     functions: set of str
+         Names of the benchmarked functions. By default, all of them.
+     seed: int
+         Seed of the graph generators.
+     log: file
+         Where the progress is written, or None.
+
+     Returns
+     -------
+     report: dict
+         The machine, the commit and the time and peak memory of each function on each graph.
+     """
+    results = []
+    for name in graph_names:
+        for n_nodes in sizes:
+            graph = GENERATORS[name](n_nodes, seed=seed)
+            for function_name, function in benchmark_cases(graph, functions):
+                duration, peak_memory = measure(function, repeat=repeat)
+                results.append({'graph': name, 'n_nodes': graph.number_of_nodes(),
+                                'n_edges': graph.number_of_edges(), 'function': function_name,
+                                'time': duration, 'peak_memory': peak_memory})
+                if log is not None:
+                    log.write('{:<12}{:>10}  {:<36}{:>10.4f} s{:>12.1f} MB\n'.format(
+                        name, n_nodes, function_name, duration, peak_memory / 1e6))
+    return {'commit': git_commit(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'networkx': nx.__version__,
+            'results': results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark paris and the dendrogram slicers.')
+    parser.add_argument('--graphs', nargs='+', default=sorted(GENERATORS), choices=sorted(GENERATORS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 5000])
+    parser.add_argument('--functions', nargs='+', default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None, help='JSON file of the results (default: standard output)')
+    args = parser.parse_args(argv)
+
+    report = run(args.graphs, args.sizes, repeat=args.repeat,
+                 functions=set(args.functions) if args.functions else None, seed=args.seed)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
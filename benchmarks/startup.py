@@ -0,0 +1,130 @@
+"""
+Time the import of python_paris in fresh interpreters and write the results as JSON, in the format of benchmarks.run so
+that two commits can be compared with benchmarks.compare.
+
+    $ python -m benchmarks.startup --output startup.json
+    $ python -m benchmarks.compare before.json startup.json
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+
+from benchmarks.run import git_commit
+
+# Import statements timed in a fresh interpreter, from the cheapest use of the package to the import of networkx alone
+# for reference.
+SCENARIOS = [
+    ('import python_paris', 'import python_paris'),
+    ('slicers', 'from python_paris import best_cluster_cut, clustering_from_cluster_cut, best_homogeneous_cut'),
+    ('paris_csr', 'from python_paris import paris_csr'),
+    ('star_import', 'from python_paris.paris import *\nfrom python_paris.cluster_cut_slicer import *'),
+    ('numpy', 'import numpy'),
+    ('networkx', 'import networkx'),
+]
+
+CHILD = """
+import sys, time
+start = time.perf_counter()
+{}
+duration = time.perf_counter() - start
+peak_memory = 0
+try:
+    # High-water mark of the process, which unlike ru_maxrss is not inherited from the parent.
+    with open('/proc/self/status') as f:
+        peak_memory = 1024 * int([l for l in f if l.startswith('VmHWM')][0].split()[1])
+except (OSError, IndexError):
+    pass
+print(repr((duration, peak_memory, 'networkx' in sys.modules, 'numpy' in sys.modules)))
+"""
+
+
+def measure_import(statement, repeat=5):
+    """
+     Measure the best wall time of an import statement over several fresh interpreters.
+
+     Parameters
+     ----------
+     statement: str
+         Python code run at the start of the interpreter.
+     repeat: int
+         Number of interpreters.
+
+     Returns
+     -------
+     time: double
+         Best wall time of the statement in seconds.
+     peak_memory: int
+         Peak resident memory of the interpreter in bytes (0 if unknown).
+     networkx, numpy: bool
+         Whether networkx and numpy were imported by the statement.
+
+     Returns None if the statement fails, e.g. on an older commit without the imported names.
+     """
+    runs = []
+    for _ in range(repeat):
+        try:
+            output = subprocess.check_output([sys.executable, '-c', CHILD.format(statement)], stderr=subprocess.DEVNULL)
+        except subprocess.CalledProcessError:
+            return None
+        runs.append(eval(output.decode().strip()))
+    duration = min(r[0] for r in runs)
+    peak_memory, networkx, numpy = runs[-1][1:]
+    return duration, peak_memory, networkx, numpy
+
+
+def run(repeat=5, log=sys.stderr):
+    """
+     Run the startup benchmarks.
+
+     Parameters
+     ----------
+     repeat: int
+         Number of fresh interpreters per scenario.
+     log: file
+         Where the progress is written, or None.
+
+     Returns
+     -------
+     report: dict
+         The machine, the commit and the import time and peak memory of each scenario.
+     """
+    results = []
+    for name, statement in SCENARIOS:
+        measure = measure_import(statement, repeat=repeat)
+        if measure is None:
+            if log is not None:
+                log.write('{:<24}{:>12}\n'.format(name, 'failed'))
+            continue
+        duration, peak_memory, networkx, numpy = measure
+        results.append({'graph': 'startup', 'n_nodes': 0, 'n_edges': 0, 'function': name, 'time': duration,
+                        'peak_memory': peak_memory, 'networkx': networkx, 'numpy': numpy})
+        if log is not None:
+            log.write('{:<24}{:>10.4f} s{:>12.1f} MB  networkx: {:<6}numpy: {}\n'.format(
+                name, duration, peak_memory / 1e6, str(networkx), numpy))
+    return {'commit': git_commit(),
+            'machine': platform.machine(),
+            'processor': platform.processor(),
+            'platform': platform.platform(),
+            'python': platform.python_version(),
+            'results': results}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the import time of python_paris.')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', default=None, help='JSON file of the results (default: standard output)')
+    args = parser.parse_args(argv)
+
+    report = run(repeat=args.repeat)
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -6,6 +6,7 @@ Demo of the Paris algorithm on a simple graph
 """
 print(__doc__)
 
+import networkx as nx
 from community import best_partition
 from python_paris.paris import *
 from python_paris.cluster_cut_slicer import *
@@ -1 +1,76 @@
-from .paris import paris
\ No newline at end of file
+import importlib
+
+# The paris submodule is imported eagerly: its name is also the name of the function, and the import system would
+# rebind the attribute to the submodule when another submodule imports it. It only needs numpy, networkx is imported
+# when a graph is passed to paris.
+from .paris import paris, paris_csr, resume_paris, save_checkpoint, load_checkpoint, reorder_dendrogram, ParisStats, \
+    CancellationToken, ParisCancelled
+
+# Public API of the other submodules: name -> submodule. They are only imported on first access of one of their names,
+# so that importing the package stays cheap for short-lived jobs that use a few functions.
+_API = {
+    'clustering_from_cluster_cut': 'cluster_cut_slicer',
+    'best_cluster_cut': 'cluster_cut_slicer',
+    'ranking_cluster_cuts': 'cluster_cut_slicer',
+    'conductance_cluster_cuts': 'cluster_cut_slicer',
+    'clustering_from_homogeneous_cut': 'homogeneous_cut_slicer',
+    'best_homogeneous_cut': 'homogeneous_cut_slicer',
+    'ranking_homogeneous_cuts': 'homogeneous_cut_slicer',
+    'modularity_homogeneous_cuts': 'homogeneous_cut_slicer',
+    'clustering_from_heterogeneous_cut': 'heterogeneous_cut_slicer',
+    'best_heterogeneous_cut': 'heterogeneous_cut_slicer',
+    'ranking_heterogeneous_cuts': 'heterogeneous_cut_slicer',
+    'clustering_from_distance': 'distance_slicer',
+    'best_distance': 'distance_slicer',
+    'ranking_distances': 'distance_slicer',
+    'cuts_from_resolutions': 'resolution_slicer',
+    'clusterings_from_resolutions': 'resolution_slicer',
+    'modularity_from_resolutions': 'resolution_slicer',
+    'resolution_sweep': 'resolution_slicer',
+    'merge_scores': 'dendrogram_utils',
+    'sharp_score': 'dendrogram_utils',
+    'preorder': 'traversal',
+    'postorder': 'traversal',
+    'leaves': 'traversal',
+    'LeafIndex': 'traversal',
+    'save_csr': 'out_of_core',
+    'load_csr': 'out_of_core',
+    'paris_out_of_core': 'out_of_core',
+    'EdgeReservoir': 'sampling',
+    'paris_from_stream': 'sampling',
+    'paris_batch': 'batch',
+    'block_diagonal_csr': 'batch',
+    'project_dendrogram': 'projection',
+    'DendrogramProjector': 'projection',
+    'encode_dendrogram': 'compression',
+    'decode_dendrogram': 'compression',
+    'save_dendrogram': 'compression',
+    'load_dendrogram': 'compression',
+    'CompressedDendrogram': 'compression',
+    'to_linkage': 'conversion',
+    'from_linkage': 'conversion',
+    'write_newick': 'conversion',
+    'write_json': 'conversion',
+    'finite_distances': 'conversion',
+    'to_parent_pointers': 'conversion',
+    'from_parent_pointers': 'conversion',
+    'DendrogramServer': 'server',
+    'DendrogramClient': 'server',
+    'LocalClient': 'server',
+    'membership': 'server',
+}
+
+__all__ = ['paris', 'paris_csr', 'resume_paris', 'save_checkpoint', 'load_checkpoint', 'reorder_dendrogram',
+           'ParisStats', 'CancellationToken', 'ParisCancelled'] + sorted(_API)
+
+
+def __getattr__(name):
+    if name in _API:
+        value = getattr(importlib.import_module('.' + _API[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_API))
@@ -0,0 +1,227 @@
+"""
+Command-line interface: read an edge list, compute the paris hierarchy and write the dendrogram, the best and ranked
+cuts and the label vectors in one pass.
+
+    $ python -m python_paris edges.txt -o dendrogram.npy --best homogeneous distance --labels labels.tsv
+    $ zcat edges.txt.gz | python -m python_paris - -o dendrogram.npy --rank cluster --top 5 --threads 8
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+from array import array
+
+import numpy as np
+
+KINDS = ['cluster', 'homogeneous', 'heterogeneous', 'distance']
+
+
+def read_edges(f, delimiter=None, comments='#', integer_nodes=False):
+    """
+     Read an edge list line by line and build the symmetric CSR adjacency of the graph. Each line contains two nodes
+     and an optional weight (1 by default). Repeated edges are summed.
+
+     Parameters
+     ----------
+     f: file
+         Text file of the edge list.
+     delimiter: str
+         Separator of the columns. By default, any whitespace.
+     comments: str
+         Lines starting with this prefix are skipped.
+     integer_nodes: bool
+         If True, the nodes are the integers 0 to n-1 and are used as labels directly. Otherwise the nodes are labeled
+         by their order of appearance.
+
+     Returns
+     -------
+     indptr, indices, data: numpy.array
+         The CSR adjacency.
+     nodes: list
+         The name of each node label (None if integer_nodes).
+     """
+    index = {}
+    nodes = []
+    rows = array('q')
+    cols = array('q')
+    weights = array('d')
+    for line in f:
+        if not line.strip() or (comments and line.startswith(comments)):
+            continue
+        fields = line.rstrip('\r\n').split(delimiter)
+        if len(fields) < 2:
+            raise ValueError('invalid edge: {!r}'.format(line))
+        if integer_nodes:
+            u, v = int(fields[0]), int(fields[1])
+        else:
+            u = index.get(fields[0])
+            if u is None:
+                u = index[fields[0]] = len(nodes)
+                nodes.append(fields[0])
+            v = index.get(fields[1])
+            if v is None:
+                v = index[fields[1]] = len(nodes)
+                nodes.append(fields[1])
+        rows.append(u)
+        cols.append(v)
+        weights.append(float(fields[2]) if len(fields) > 2 else 1.)
+
+    rows = np.frombuffer(rows, dtype=np.int64) if len(rows) else np.zeros(0, dtype=np.int64)
+    cols = np.frombuffer(cols, dtype=np.int64) if len(cols) else np.zeros(0, dtype=np.int64)
+    weights = np.frombuffer(weights, dtype=float) if len(weights) else np.zeros(0)
+    if integer_nodes:
+        if len(rows) and min(rows.min(), cols.min()) < 0:
+            raise ValueError
+        n_nodes = int(max(rows.max(), cols.max())) + 1 if len(rows) else 0
+    else:
+        n_nodes = len(nodes)
+    keys, inverse = np.unique(np.concatenate((rows * n_nodes + cols, cols * n_nodes + rows)), return_inverse=True)
+    # np.bincount returns integers when there is no edge.
+    data = np.bincount(inverse, weights=np.concatenate((weights, weights)), minlength=len(keys)).astype(float)
+    # A self-loop appears twice in the symmetrized list but is a single edge.
+    data[keys // max(n_nodes, 1) == keys % max(n_nodes, 1)] /= 2
+    indices = keys % max(n_nodes, 1)
+    indptr = np.concatenate(([0], np.cumsum(np.bincount(keys // max(n_nodes, 1), minlength=n_nodes))))
+    return indptr, indices, data, nodes if not integer_nodes else None
+
+
+def labels_from_clustering(clustering, n_nodes):
+    """
+     Convert a partition (list of clusters) or a single cluster (list of nodes) to a label vector. The nodes out of
+     the clusters are labeled -1, the nodes of a single cluster are labeled 0.
+     """
+    labels = -np.ones(n_nodes, dtype=np.int64)
+    if len(clustering) > 0 and not isinstance(clustering[0], list):
+        clustering = [clustering]
+    for label, cluster in enumerate(clustering):
+        labels[cluster] = label
+    return labels
+
+
+def best_cut(dendrogram, kind):
+    from . import cluster_cut_slicer, homogeneous_cut_slicer, heterogeneous_cut_slicer, distance_slicer
+    if kind == 'cluster':
+        cut, score = cluster_cut_slicer.best_cluster_cut(dendrogram)
+        # No cluster cut (e.g. a single edge): all the nodes are labeled -1.
+        clustering = cluster_cut_slicer.clustering_from_cluster_cut(dendrogram, cut) if cut >= 0 else []
+    elif kind == 'homogeneous':
+        cut, score = homogeneous_cut_slicer.best_homogeneous_cut(dendrogram)
+        clustering = homogeneous_cut_slicer.clustering_from_homogeneous_cut(dendrogram, cut)
+    elif kind == 'heterogeneous':
+        cut, score = heterogeneous_cut_slicer.best_heterogeneous_cut(dendrogram)
+        clustering = heterogeneous_cut_slicer.clustering_from_heterogeneous_cut(dendrogram, cut)
+    else:
+        cut, score = distance_slicer.best_distance(dendrogram)
+        clustering = distance_slicer.clustering_from_distance(dendrogram, cut)
+    return cut, score, clustering
+
+
+def ranked_cuts(dendrogram, kind, top, n_jobs):
+    from . import cluster_cut_slicer, homogeneous_cut_slicer, heterogeneous_cut_slicer, distance_slicer
+    if kind == 'cluster':
+        cuts, scores = cluster_cut_slicer.ranking_cluster_cuts(dendrogram, n_jobs=n_jobs)
+    elif kind == 'homogeneous':
+        cuts, scores = homogeneous_cut_slicer.ranking_homogeneous_cuts(dendrogram, n_jobs=n_jobs)
+    elif kind == 'heterogeneous':
+        cuts, scores = heterogeneous_cut_slicer.ranking_heterogeneous_cuts(dendrogram, top)
+    else:
+        cuts, scores = distance_slicer.ranking_distances(dendrogram)
+    return cuts[:top], scores[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m python_paris',
+                                     description='Compute the paris hierarchy of a graph given as an edge list.')
+    parser.add_argument('input', nargs='?', default='-', help='edge list file, - for the standard input (default)')
+    parser.add_argument('-o', '--output', default='dendrogram.npy',
+                        help='dendrogram file (.npy, or .pdz for the compressed format)')
+    parser.add_argument('--delimiter', default=None, help='column separator (default: whitespace)')
+    parser.add_argument('--integer-nodes', action='store_true', help='the nodes are the integers 0 to n-1')
+    parser.add_argument('--nodes', default=None, help='file of the node names, one per line, in label order')
+    parser.add_argument('--best', nargs='+', default=[], choices=KINDS, help='best cuts to compute')
+    parser.add_argument('--rank', nargs='+', default=[], choices=KINDS, help='rankings of cuts to compute')
+    parser.add_argument('--top', type=int, default=10, help='length of the rankings')
+    parser.add_argument('--cuts', default='-', help='JSON file of the best and ranked cuts (default: standard output)')
+    parser.add_argument('--labels', default=None, help='TSV file of the label vectors of the best cuts')
+    parser.add_argument('--threads', type=int, default=1, help='workers scoring the cuts of the rankings')
+    parser.add_argument('--memory-budget', type=int, default=None,
+                        help='memory budget in bytes of the adjacency during the clustering, switches to the '
+                             'out-of-core paris (the edge list is still read in memory)')
+    parser.add_argument('--quiet', action='store_true', help='do not print the timing summary')
+    args = parser.parse_args(argv)
+
+    timings = []
+    start = time.perf_counter()
+    if args.input == '-':
+        indptr, indices, data, nodes = read_edges(sys.stdin, args.delimiter, integer_nodes=args.integer_nodes)
+    else:
+        with open(args.input) as f:
+            indptr, indices, data, nodes = read_edges(f, args.delimiter, integer_nodes=args.integer_nodes)
+    n_nodes = len(indptr) - 1
+    timings.append(('read', time.perf_counter() - start))
+    if n_nodes == 0:
+        parser.error('empty graph: no edge in {}'.format(args.input))
+
+    start = time.perf_counter()
+    if args.memory_budget is None:
+        from .paris import paris_csr
+        dendrogram = paris_csr(indptr, indices, data)
+    else:
+        from .out_of_core import save_csr, paris_out_of_core
+        with tempfile.TemporaryDirectory() as directory:
+            save_csr(directory, indptr, indices, data)
+            del indptr, indices, data
+            dendrogram = paris_out_of_core(directory, memory_budget=args.memory_budget)
+    timings.append(('paris', time.perf_counter() - start))
+
+    start = time.perf_counter()
+    if args.output.endswith('.pdz'):
+        from .compression import save_dendrogram
+        save_dendrogram(args.output, dendrogram)
+    else:
+        np.save(args.output, dendrogram)
+    if args.nodes is not None:
+        with open(args.nodes, 'w') as f:
+            for node in (nodes if nodes is not None else range(n_nodes)):
+                f.write('{}\n'.format(node))
+    timings.append(('write', time.perf_counter() - start))
+
+    if args.best or args.rank:
+        start = time.perf_counter()
+        results = {'best': {}, 'ranking': {}}
+        labels = []
+        for kind in args.best:
+            cut, score, clustering = best_cut(dendrogram, kind)
+            results['best'][kind] = {'cut': cut, 'score': score}
+            labels.append(labels_from_clustering(clustering, n_nodes))
+        for kind in args.rank:
+            cuts, scores = ranked_cuts(dendrogram, kind, args.top, args.threads)
+            results['ranking'][kind] = {'cuts': cuts, 'scores': scores}
+        # The non-finite scores and distances (e.g. between disconnected components) are written as null.
+        from .server import to_json
+        results = to_json(results)
+        if args.cuts == '-':
+            json.dump(results, sys.stdout, indent=2, allow_nan=False)
+            sys.stdout.write('\n')
+        else:
+            with open(args.cuts, 'w') as f:
+                json.dump(results, f, indent=2, allow_nan=False)
+        if args.labels is not None and labels:
+            with open(args.labels, 'w') as f:
+                f.write('\t'.join(['node'] + args.best) + '\n')
+                for i in range(n_nodes):
+                    f.write('\t'.join([str(nodes[i] if nodes is not None else i)] +
+                                      [str(l[i]) for l in labels]) + '\n')
+        timings.append(('slice', time.perf_counter() - start))
+
+    if not args.quiet:
+        sys.stderr.write('{} nodes, {} merges\n'.format(n_nodes, n_nodes - 1))
+        for name, duration in timings:
+            sys.stderr.write('{:<8}{:>10.3f} s\n'.format(name, duration))
+        sys.stderr.write('{:<8}{:>10.3f} s\n'.format('total', sum(duration for _, duration in timings)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,157 @@
+import os
+from itertools import chain
+
+import numpy as np
+from .paris import paris_chain
+from .dendrogram_utils import node_degrees
+
+
+def block_diagonal_csr(graphs):
+    """
+     Stack graphs in CSR format into one block-diagonal CSR adjacency, as expected by paris_batch.
+
+     Parameters
+     ----------
+     graphs: list of tuple
+         The (indptr, indices, data) CSR adjacency of each graph.
+
+     Returns
+     -------
+     indptr, indices, data: numpy.array
+         The block-diagonal CSR adjacency. The nodes of the graph g are offsets[g] to offsets[g + 1] - 1.
+     offsets: numpy.array
+         Index of the first node of each graph, followed by the total number of nodes.
+     """
+    sizes = [len(g[0]) - 1 for g in graphs]
+    offsets = np.concatenate(([0], np.cumsum(sizes))).astype(np.int64)
+    n_entries = np.concatenate(([0], np.cumsum([g[0][-1] for g in graphs]))).astype(np.int64)
+    indptr = np.concatenate([[0]] + [np.asarray(g[0][1:], dtype=np.int64) + n_entries[i]
+                                     for i, g in enumerate(graphs)]).astype(np.int64)
+    indices = np.concatenate([np.zeros(0, dtype=np.int64)] + [np.asarray(g[1], dtype=np.int64) + offsets[i]
+                                                              for i, g in enumerate(graphs)])
+    data = np.concatenate([np.zeros(0)] + [np.asarray(g[2], dtype=float) for g in graphs])
+    return indptr, indices, data, offsets
+
+
+def paris_batch(indptr, indices, data, offsets, node_weights=None, n_jobs=1, chunk_size=None, concatenate=False):
+    """
+     Given many graphs stacked in one block-diagonal CSR adjacency, compute the paris hierarchy of each graph. The
+     conversions of the arrays, the node weights and the reordering of the dendrograms are done once for all the
+     graphs, so that the cost of a small graph is close to the cost of its nearest-neighbor chain.
+
+     Parameters
+     ----------
+     indptr, indices, data: numpy.array
+         The block-diagonal CSR adjacency, e.g. from block_diagonal_csr. The adjacency of each graph must be symmetric
+         and there must be no edge between two graphs.
+     offsets: numpy.array
+         Index of the first node of each graph, followed by the total number of nodes. Each graph has at least one
+         node.
+     node_weights: numpy.array
+         Weight of each node. By default, its degree with the self-loops counted twice, as in paris_csr.
+     n_jobs: int
+         Number of processes. 1 runs in the current process, -1 uses one process per CPU.
+     chunk_size: int
+         Number of graphs sent to a process at once. By default, about 4 chunks per process.
+     concatenate: bool
+         If True, return the dendrograms as a single array with row offsets instead of a list.
+
+     Returns
+     -------
+     dendrograms: list of numpy.array
+         The dendrogram of each graph, as returned by paris_csr, with the nodes of each graph labeled from 0.
+     (dendrograms, row_offsets): numpy.array
+         Only if concatenate is True: the rows of the dendrogram of the graph g are
+         dendrograms[row_offsets[g]:row_offsets[g + 1]].
+
+     References
+     ----------
+     -
+     """
+    indptr = np.asarray(indptr, dtype=np.int64)
+    indices = np.asarray(indices, dtype=np.int64)
+    data = np.asarray(data, dtype=float)
+    offsets = np.asarray(offsets, dtype=np.int64)
+    n_graphs = len(offsets) - 1
+    if len(offsets) < 1 or offsets[0] != 0 or offsets[-1] != len(indptr) - 1 or np.any(np.diff(offsets) < 1):
+        raise ValueError
+    if node_weights is None:
+        node_weights = node_degrees(indptr, indices, data)
+    elif len(node_weights) != offsets[-1]:
+        raise ValueError
+    node_weights = np.asarray(node_weights, dtype=float)
+
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs < 1:
+        raise ValueError
+    if n_jobs == 1 or n_graphs <= 1:
+        dendrograms, row_offsets = _paris_blocks(indptr, indices, data, offsets, node_weights)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        if chunk_size is None:
+            chunk_size = max(1, -(-n_graphs // (4 * n_jobs)))
+        chunks = []
+        for g in range(0, n_graphs, chunk_size):
+            first, last = offsets[g], offsets[min(g + chunk_size, n_graphs)]
+            chunks.append((indptr[first:last + 1] - indptr[first], indices[indptr[first]:indptr[last]] - first,
+                           data[indptr[first]:indptr[last]], offsets[g:g + chunk_size + 1] - first,
+                           node_weights[first:last]))
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            results = list(executor.map(_paris_blocks, *zip(*chunks)))
+        dendrograms = np.concatenate([r[0] for r in results])
+        row_offsets = np.concatenate([[0]] + [r[1][1:] + n_rows for r, n_rows in
+                                              zip(results, np.cumsum([0] + [len(r[0]) for r in results]))])
+
+    if concatenate:
+        return dendrograms, row_offsets
+    return [dendrograms[row_offsets[g]:row_offsets[g + 1]] for g in range(n_graphs)]
+
+
+def _paris_blocks(indptr, indices, data, offsets, node_weights):
+    n_graphs = len(offsets) - 1
+    sizes = np.diff(offsets)
+    graphs = np.repeat(np.arange(n_graphs), sizes)
+    rows = np.repeat(np.arange(offsets[-1]), np.diff(indptr))
+    row_graphs = graphs[rows]
+    if np.any(indices < offsets[row_graphs]) or np.any(indices >= offsets[row_graphs + 1]):
+        raise ValueError('edge between two graphs')
+    local_rows = (rows - offsets[row_graphs]).tolist()
+    local_indices = (indices - offsets[row_graphs]).tolist()
+    weights = data.tolist()
+    w_list = node_weights.tolist()
+    entries = indptr[offsets].tolist()
+
+    merges = []
+    for g, n_nodes in enumerate(sizes.tolist()):
+        first = int(offsets[g])
+        if n_nodes == 1:
+            continue
+        w = dict(enumerate(w_list[first:first + n_nodes]))
+        s = dict.fromkeys(range(n_nodes), 1)
+        adjacency = {u: {} for u in range(n_nodes)}
+        for u, v, weight in zip(local_rows[entries[g]:entries[g + 1]], local_indices[entries[g]:entries[g + 1]],
+                                weights[entries[g]:entries[g + 1]]):
+            if u != v:
+                adjacency[u][v] = adjacency[u].get(v, 0.) + weight
+        # The merges are kept as a flat list of numbers: lists of lists would be tracked by the garbage collector,
+        # whose collections would then slow down the chains of the next graphs.
+        merges.extend(chain.from_iterable(paris_chain(adjacency, w, s,
+                                                      float(np.sum(node_weights[first:first + n_nodes])))))
+
+    # Reorder the merges of all the graphs at once by (graph, distance, merge index), as reorder_dendrogram does for
+    # each graph.
+    row_offsets = np.concatenate(([0], np.cumsum(sizes - 1)))
+    merges = np.array(merges, dtype=float).reshape(-1, 4)
+    merge_graphs = np.repeat(np.arange(n_graphs), sizes - 1)
+    index = np.lexsort((np.arange(len(merges)) - row_offsets[merge_graphs], merges[:, 2], merge_graphs))
+    rank = np.empty(len(merges), dtype=np.int64)
+    rank[index] = np.arange(len(merges))
+    dendrograms = merges[index]
+    children = dendrograms[:, :2].astype(np.int64)
+    n_nodes = sizes[merge_graphs][:, np.newaxis]
+    internal = children >= n_nodes
+    first_row = row_offsets[merge_graphs][:, np.newaxis]
+    reordered = n_nodes + rank[np.where(internal, first_row + children - n_nodes, 0)] - first_row
+    dendrograms[:, :2] = np.where(internal, reordered, children)
+    return dendrograms, row_offsets
@@ -1,4 +1,5 @@
 import numpy as np
+from .dendrogram_utils import cluster_internal_weights, cluster_weights, merge_scores, node_degrees, sharp_score
 
 
 def clustering_from_cluster_cut(dendrogram, cut):
@@ -46,7 +47,7 @@ class ClusterTree:
         self.right = None
 
 
-def best_cluster_cut(dendrogram, scoring=lambda w, x, y: w * (np.log(x) - np.log(y))):
+def best_cluster_cut(dendrogram, scoring=sharp_score):
     """
      Given a dendrogram and a scoring function, compute the cut level with the best cluster score with respect
      to the scoring function
@@ -111,7 +112,7 @@ def best_cluster_cut(dendrogram, scoring=lambda w, x, y: w * (np.log(x) - np.log
     return best_cut, best_cut_score
 
 
-def ranking_cluster_cuts(dendrogram, scoring=lambda w, x, y: w * (np.log(x) - np.log(y))):
+def ranking_cluster_cuts(dendrogram, scoring=sharp_score, n_jobs=1, backend='thread'):
     """
      Given a dendrogram and a scoring function, compute the ranking of the cluster cuts with the best cluster score with
       respect to the scoring function
@@ -124,6 +125,10 @@ def ranking_cluster_cuts(dendrogram, scoring=lambda w, x, y: w * (np.log(x) - np
      scoring: function
          Function that computes the score of a cluster thanks to its number of nodes (w), its creation distance (x) and
          its merged distance (y)
+     n_jobs: int
+         Number of workers scoring the clusters, as in merge_scores. The ranking does not depend on it.
+     backend: str
+         'thread' or 'process' pool of workers, as in merge_scores.
 
      Returns
      -------
@@ -139,6 +144,7 @@ def ranking_cluster_cuts(dendrogram, scoring=lambda w, x, y: w * (np.log(x) - np
      -
      """
     n_nodes = np.shape(dendrogram)[0] + 1
+    scores = merge_scores(dendrogram, scoring, n_jobs=n_jobs, backend=backend)
     cuts = []
     cut_scores = {}
     cluster_trees = {t: ClusterTree(t, 0, 1) for t in range(n_nodes)}
@@ -151,17 +157,11 @@ def ranking_cluster_cuts(dendrogram, scoring=lambda w, x, y: w * (np.log(x) - np
         new_distance = dendrogram[t, 2]
         new_size = dendrogram[t, 3]
 
-        if left_tree.distance > 0.:
-            left_tree.score = scoring(left_tree.size, new_distance, left_tree.distance)
-        else:
-            left_tree.score = 0.
+        left_tree.score = scores[2 * t]
         cuts.append(left_tree.cluster_label)
         cut_scores[left_tree.cluster_label] = left_tree.score
 
-        if right_tree.distance > 0.:
-            right_tree.score = scoring(right_tree.size, new_distance, right_tree.distance)
-        else:
-            right_tree.score = 0.
+        right_tree.score = scores[2 * t + 1]
         cuts.append(right_tree.cluster_label)
         cut_scores[right_tree.cluster_label] = right_tree.score
 
@@ -174,3 +174,50 @@ def ranking_cluster_cuts(dendrogram, scoring=lambda w, x, y: w * (np.log(x) - np
     ranked_cut_scores = sorted(list(cut_scores.values()), reverse=True)
 
     return ranked_cuts, ranked_cut_scores
+
+
+def conductance_cluster_cuts(dendrogram, indptr, indices, data, node_weights=None):
+    """
+     Given a dendrogram and the graph it comes from, compute the conductance of every cluster cut level in one walk
+     through the merges.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster
+     indptr: numpy.array
+         Index pointers of the CSR adjacency of the graph.
+     indices: numpy.array
+         Column indices of the CSR adjacency. The adjacency must be symmetric.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+     node_weights: numpy.array
+         Weight of each node. By default, its degree with the self-loops counted twice, as in paris (see
+         node_degrees). The self-loops never leave a cluster.
+
+     Returns
+     -------
+     conductances: numpy.array
+         The conductance of the cluster of each cut level, i.e. the weight leaving the cluster divided by the smallest
+         of the weights of the cluster and of its complement. The cut level can go from 0 to 2*n -2 with n the number
+         of nodes. The conductance of the last cluster, which contains all the nodes, is 0.
+
+     References
+     ----------
+     -
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    if node_weights is None:
+        node_weights = node_degrees(indptr, indices, data)
+    w = cluster_weights(dendrogram, node_weights)
+    wtot = float(np.sum(node_weights))
+    # The self-loops are counted twice in the node weights but once in the internal weights.
+    rows = np.repeat(np.arange(n_nodes), np.diff(np.asarray(indptr)))
+    loops = rows == np.asarray(indices)
+    self_loops = np.bincount(rows[loops], weights=np.asarray(data, dtype=float)[loops], minlength=n_nodes)
+    cut = w - cluster_internal_weights(dendrogram, indptr, indices, data) - cluster_weights(dendrogram, self_loops)
+    volume = np.minimum(w, wtot - w)
+    conductances = np.zeros(len(w))
+    np.divide(cut, volume, out=conductances, where=volume > 0)
+    return conductances
@@ -0,0 +1,267 @@
+import mmap
+import struct
+import zlib
+
+import numpy as np
+from .dendrogram_utils import cluster_sizes
+
+MAGIC = b'PARISDZ2'
+# Magic, number of nodes, number of merges per block, mantissa bits of the distances (0 if lossless).
+HEADER = struct.Struct('<8sQIB')
+
+
+def _shuffle(array):
+    # Byte transposition: the i-th bytes of all the values are stored together, which zlib compresses much better for
+    # small integers.
+    return np.ascontiguousarray(array.view(np.uint8).reshape(-1, array.itemsize).T).tobytes()
+
+
+def _unshuffle(buffer, dtype):
+    dtype = np.dtype(dtype)
+    array = np.frombuffer(buffer, dtype=np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(array.T).view(dtype).ravel()
+
+
+def quantize_distances(distances, distance_bits):
+    """
+     Round the finite distances to distance_bits bits of mantissa. The relative error is at most 2^-(distance_bits+1)
+     and the order of the distances is preserved.
+     """
+    distances = np.array(distances, dtype=float)
+    shift = 52 - distance_bits
+    if shift <= 0:
+        return distances
+    bits = distances.view(np.int64)
+    rounded = ((bits + (1 << (shift - 1))) >> shift) << shift
+    keep = np.isfinite(distances) & np.isfinite(rounded.view(float))
+    bits[keep] = rounded[keep]
+    return distances
+
+
+def encode_dendrogram(dendrogram, block_size=65536, distance_bits=None, level=6):
+    """
+     Given a dendrogram, encode it in a compact binary format, by blocks of merges that can be decoded independently.
+
+     The merged nodes of the merge t are stored as their difference with the label n+t of the new cluster, in the
+     smallest integer type of the block. The sizes of the clusters are recomputed from the merged nodes: only the sizes
+     of the clusters created before a block and merged in the block are stored with the block, so that each block is
+     decoded on its own. The distances are stored as the differences of their IEEE 754 representations, which are
+     small since the distances are sorted. Each stream of each block is then byte-shuffled and compressed with zlib.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     block_size: int
+         Number of merges per block.
+     distance_bits: int
+         If given, the distances are rounded to this number of bits of mantissa (from 1 to 52) before encoding, see
+         quantize_distances. By default, the distances are stored exactly.
+     level: int
+         Compression level of zlib.
+
+     Returns
+     -------
+     data: bytes
+         The encoded dendrogram.
+
+     References
+     ----------
+     -
+     """
+    dendrogram = np.asarray(dendrogram, dtype=float).reshape(-1, 4)
+    n_nodes = np.shape(dendrogram)[0] + 1
+    if block_size < 1 or (distance_bits is not None and not 1 <= distance_bits <= 52):
+        raise ValueError
+    labels = np.arange(n_nodes, 2 * n_nodes - 1)[:, np.newaxis]
+    deltas = labels - dendrogram[:, :2].astype(np.int64)
+    if np.any(deltas < 1) or np.any(deltas > labels):
+        raise ValueError
+    distances = dendrogram[:, 2] if distance_bits is None else quantize_distances(dendrogram[:, 2], distance_bits)
+    bits = distances.view(np.int64)
+    children = labels - deltas
+    sizes = cluster_sizes(dendrogram)
+
+    blocks = []
+    for start in range(0, n_nodes - 1, block_size):
+        stop = min(start + block_size, n_nodes - 1)
+        blocks.append(_encode_integers(deltas[start:stop].ravel(), level))
+        block = np.diff(bits[start:stop], prepend=np.int64(0))
+        blocks.append(zlib.compress(_shuffle(block), level))
+        block = children[start:stop].ravel()
+        blocks.append(_encode_integers(sizes[block[(block >= n_nodes) & (block < n_nodes + start)]], level))
+    offsets = np.concatenate(([0], np.cumsum([len(block) for block in blocks]))).astype('<u8')
+    header = HEADER.pack(MAGIC, n_nodes, block_size, distance_bits or 0)
+    return b''.join([header, struct.pack('<Q', len(blocks) // 3), offsets.tobytes()] + blocks)
+
+
+def _encode_integers(values, level):
+    # Non-negative integers in the smallest unsigned type, whose size in bytes is the first byte of the stream.
+    largest = values.max() if len(values) else 0
+    dtype = np.dtype(np.uint16 if largest < 2 ** 16 else np.uint32 if largest < 2 ** 32 else np.uint64)
+    return bytes([dtype.itemsize]) + zlib.compress(_shuffle(values.astype(dtype)), level)
+
+
+def _decode_integers(stream):
+    return _unshuffle(zlib.decompress(stream[1:]), np.dtype('<u{}'.format(stream[0]))).astype(np.int64)
+
+
+class CompressedDendrogram:
+    """
+     Dendrogram encoded by encode_dendrogram, given as bytes or as the path of a file (which is memory-mapped until
+     close is called, or the end of a with block). The merges of any range, with their distances and sizes, are
+     decoded from the blocks of the range only.
+
+     Decoding trades time for space: a full decode is an order of magnitude slower than np.load of the same
+     dendrogram saved as .npy (about 1.5 ms against 0.1 ms for 10^4 nodes). The format suits storage, transfer and
+     the reads of a few ranges; a dendrogram that is fully read often is better kept as .npy and memory-mapped.
+     """
+    def __init__(self, source):
+        self._mmap = None
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                source = self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.buffer = memoryview(source)
+        magic, self.n_nodes, self.block_size, self.distance_bits = HEADER.unpack_from(self.buffer, 0)
+        if magic != MAGIC:
+            raise ValueError('not an encoded dendrogram')
+        n_streams = 3 * struct.unpack_from('<Q', self.buffer, HEADER.size)[0]
+        index = HEADER.size + 8
+        self.offsets = np.frombuffer(self.buffer, dtype='<u8', count=n_streams + 1, offset=index).astype(np.int64)
+        self.data_offset = index + 8 * (n_streams + 1)
+        self.n_merges = self.n_nodes - 1
+
+    def close(self):
+        """
+         Release the buffer and close the memory map of the file, if any.
+         """
+        self.buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _stream(self, i):
+        return self.buffer[self.data_offset + self.offsets[i]:self.data_offset + self.offsets[i + 1]]
+
+    def _range(self, start, stop):
+        stop = self.n_merges if stop is None else stop
+        if start < 0 or stop > self.n_merges or start > stop:
+            raise ValueError
+        return start, stop, start // self.block_size, -(-stop // self.block_size)
+
+    def _children(self, b):
+        deltas = _decode_integers(self._stream(3 * b))
+        labels = self.n_nodes + b * self.block_size + np.arange(len(deltas) // 2)
+        return labels[:, np.newaxis] - deltas.reshape(-1, 2)
+
+    def _sizes(self, b, children):
+        # Sizes of the clusters created in the block b, from the sizes of the nodes (1) and of the clusters created
+        # before the block (stored with the block). Each size is the sum of the known sizes in the subtree of the
+        # cluster within the block, summed by pointer jumping: after j steps, each cluster holds the sum over its
+        # descendants at distance less than 2^j, and adds the sums of its descendants at distance 2^j.
+        first = self.n_nodes + b * self.block_size
+        n_merges = len(children)
+        children = children.ravel()
+        known = np.ones(len(children), dtype=np.int64)
+        known[(children >= self.n_nodes) & (children < first)] = _decode_integers(self._stream(3 * b + 2))
+        local = children >= first
+        known[local] = 0
+        sizes = known.reshape(-1, 2).sum(axis=1)
+        ancestors = np.full(n_merges + 1, n_merges, dtype=np.int64)
+        ancestors[children[local] - first] = np.flatnonzero(local) // 2
+        valid = ancestors[:-1] < n_merges
+        while np.any(valid):
+            sizes = sizes + np.bincount(ancestors[:-1][valid], weights=sizes[valid],
+                                        minlength=n_merges).astype(np.int64)
+            ancestors = ancestors[ancestors]
+            valid = ancestors[:-1] < n_merges
+        return sizes
+
+    def children(self, start=0, stop=None):
+        """
+         Decode the merged nodes of the merges start to stop - 1, as an array of shape (stop - start, 2).
+         """
+        start, stop, first, last = self._range(start, stop)
+        blocks = [self._children(b) for b in range(first, last)]
+        children = np.concatenate(blocks) if blocks else np.zeros((0, 2), dtype=np.int64)
+        offset = first * self.block_size
+        return children[start - offset:stop - offset]
+
+    def distances(self, start=0, stop=None):
+        """
+         Decode the distances of the merges start to stop - 1.
+         """
+        start, stop, first, last = self._range(start, stop)
+        blocks = [np.cumsum(_unshuffle(zlib.decompress(self._stream(3 * b + 1)), '<i8')).view(float)
+                  for b in range(first, last)]
+        distances = np.concatenate(blocks) if blocks else np.zeros(0)
+        offset = first * self.block_size
+        return distances[start - offset:stop - offset]
+
+    def rows(self, start=0, stop=None):
+        """
+         Decode the lines start to stop - 1 of the dendrogram.
+         """
+        start, stop, first, last = self._range(start, stop)
+        offset = first * self.block_size
+        rows = np.zeros(((last - first) * self.block_size, 4))
+        n_rows = 0
+        for b in range(first, last):
+            children = self._children(b)
+            rows[n_rows:n_rows + len(children), :2] = children
+            rows[n_rows:n_rows + len(children), 3] = self._sizes(b, children)
+            n_rows += len(children)
+        rows = rows[start - offset:stop - offset]
+        rows[:, 2] = self.distances(start, stop)
+        return rows
+
+    def dendrogram(self):
+        """
+         Decode the whole dendrogram.
+         """
+        return self.rows()
+
+
+def decode_dendrogram(data):
+    """
+     Given a dendrogram encoded by encode_dendrogram, decode it.
+
+     Parameters
+     ----------
+     data: bytes
+         The encoded dendrogram.
+
+     Returns
+     -------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+
+     References
+     ----------
+     -
+     """
+    return CompressedDendrogram(data).dendrogram()
+
+
+def save_dendrogram(path, dendrogram, block_size=65536, distance_bits=None, level=6):
+    """
+     Save a dendrogram to a file in the format of encode_dendrogram.
+     """
+    with open(path, 'wb') as f:
+        f.write(encode_dendrogram(dendrogram, block_size=block_size, distance_bits=distance_bits, level=level))
+
+
+def load_dendrogram(path):
+    """
+     Load a dendrogram saved by save_dendrogram.
+     """
+    with open(path, 'rb') as f:
+        return decode_dendrogram(f.read())
@@ -0,0 +1,259 @@
+import json
+
+import numpy as np
+from .dendrogram_utils import cluster_sizes
+from .paris import reorder_dendrogram
+
+
+def finite_distances(dendrogram, inf_distance=None):
+    """
+     Given a dendrogram, replace the infinite distances of the merges of connected components by a finite distance.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     inf_distance: double
+         Distance replacing the infinite distances. By default, twice the largest finite distance (1 if there is none).
+
+     Returns
+     -------
+     distances: numpy.array
+         The finite distance of each merge.
+     """
+    distances = np.asarray(dendrogram, dtype=float)[:, 2]
+    infinite = np.isinf(distances)
+    if not np.any(infinite):
+        return distances
+    if inf_distance is None:
+        finite = distances[~infinite]
+        inf_distance = 2 * np.max(finite) if len(finite) > 0 and np.max(finite) > 0 else 1.
+    distances = distances.copy()
+    distances[infinite] = inf_distance
+    return distances
+
+
+def to_linkage(dendrogram, inf_distance=None):
+    """
+     Given a dendrogram, compute the corresponding SciPy linkage matrix, as used by scipy.cluster.hierarchy.
+
+     The dendrogram of paris has the layout of a linkage matrix, so no copy is made when the dendrogram is a contiguous
+     float array without infinite distances.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     inf_distance: double
+         Distance replacing the infinite distances of the merges of connected components, as in finite_distances.
+
+     Returns
+     -------
+     linkage: numpy.array
+         The linkage matrix.
+     """
+    linkage = np.ascontiguousarray(dendrogram, dtype=float)
+    if np.any(np.isinf(linkage[:, 2])):
+        linkage = linkage.copy()
+        linkage[:, 2] = finite_distances(linkage, inf_distance)
+    return linkage
+
+
+def from_linkage(linkage):
+    """
+     Given a SciPy linkage matrix, compute the corresponding dendrogram. The rows are reordered by increasing
+     distances if needed.
+
+     Parameters
+     ----------
+     linkage: numpy.array
+         The linkage matrix.
+
+     Returns
+     -------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     """
+    dendrogram = np.ascontiguousarray(linkage, dtype=float)
+    if np.any(np.diff(dendrogram[:, 2]) < 0):
+        dendrogram = reorder_dendrogram(dendrogram)
+    return dendrogram
+
+
+def to_parent_pointers(dendrogram):
+    """
+     Given a dendrogram, compute the parent of each cluster.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+
+     Returns
+     -------
+     parents: numpy.array
+         The parent of each of the 2n-1 clusters, -1 for the root. The n first clusters are the sole nodes, the
+         cluster n+t is the cluster created after t merges.
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    children = np.asarray(dendrogram)[:, :2].astype(np.int64)
+    parents = -np.ones(2 * n_nodes - 1, dtype=np.int64)
+    parents[children[:, 0]] = np.arange(n_nodes, 2 * n_nodes - 1)
+    parents[children[:, 1]] = np.arange(n_nodes, 2 * n_nodes - 1)
+    return parents
+
+
+def from_parent_pointers(parents, distances):
+    """
+     Given the parent of each cluster of a binary hierarchy and the distance of each merge, compute the dendrogram.
+
+     Parameters
+     ----------
+     parents: numpy.array
+         The parent of each of the 2n-1 clusters, -1 for the root. The n first clusters are the sole nodes, the root
+         is the cluster 2n-2 and the parent of a cluster has a larger label than the cluster. ValueError is raised
+         otherwise.
+     distances: numpy.array
+         The distance of the merge creating each cluster n+t, for t from 0 to n-2.
+
+     Returns
+     -------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster. The lines are sorted with respect to increasing distances.
+     """
+    parents = np.asarray(parents, dtype=np.int64)
+    if len(parents) % 2 == 0:
+        raise ValueError
+    n_nodes = (len(parents) + 1) // 2
+    # The root is the last cluster, each other cluster has a larger parent and each parent has two children.
+    if len(distances) != n_nodes - 1 or parents[-1] >= 0 or np.any(parents[:-1] <= np.arange(2 * n_nodes - 2)) or \
+            np.any(parents >= 2 * n_nodes - 1) or \
+            np.any(np.bincount(parents[:-1], minlength=2 * n_nodes - 1)[n_nodes:] != 2):
+        raise ValueError
+    index = np.argsort(parents, kind='stable')[1:]
+    children = index.reshape(-1, 2)
+    dendrogram = np.zeros((n_nodes - 1, 4))
+    dendrogram[:, :2] = children
+    dendrogram[:, 2] = distances
+    dendrogram[:, 3] = cluster_sizes(dendrogram)[n_nodes:]
+    if np.any(np.diff(dendrogram[:, 2]) < 0):
+        dendrogram = reorder_dendrogram(dendrogram)
+    return dendrogram
+
+
+def _tokens(dendrogram, inf_distance):
+    # Depth-first traversal with an explicit stack: yields ('leaf', node, height of parent), ('open', node, height of
+    # parent), ('sep', None, None) and ('close', node, height of parent) tokens.
+    n_nodes = np.shape(dendrogram)[0] + 1
+    children = np.asarray(dendrogram)[:, :2].astype(np.int64).tolist()
+    heights = [0.] * n_nodes + finite_distances(dendrogram, inf_distance).tolist()
+    stack = [(2 * n_nodes - 2, None)]
+    while stack:
+        node, parent_height = stack.pop()
+        if node is None:
+            yield 'sep', None, None
+        elif node < 0:
+            yield 'close', -node - 1, parent_height
+        elif node < n_nodes:
+            yield 'leaf', node, parent_height
+        else:
+            left, right = children[node - n_nodes]
+            height = heights[node]
+            yield 'open', node, parent_height
+            stack.append((-node - 1, parent_height))
+            stack.append((right, height))
+            stack.append((None, None))
+            stack.append((left, height))
+
+
+def _newick_label(label):
+    label = str(label)
+    if any(c in label for c in ' ()[]\':;,'):
+        return "'" + label.replace("'", "''") + "'"
+    return label
+
+
+def write_newick(dendrogram, f, labels=None, inf_distance=None, buffer_size=65536):
+    """
+     Given a dendrogram, write the hierarchy in the Newick format, without recursion and by chunks.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     f: file
+         Text file where the tree is written.
+     labels: list
+         Label of each node. By default, the index of the node.
+     inf_distance: double
+         Distance replacing the infinite distances of the merges of connected components, as in finite_distances.
+     buffer_size: int
+         Number of tokens written at once.
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    heights = [0.] * n_nodes + finite_distances(dendrogram, inf_distance).tolist()
+    buffer = []
+    for kind, node, parent_height in _tokens(dendrogram, inf_distance):
+        if kind == 'open':
+            buffer.append('(')
+        elif kind == 'sep':
+            buffer.append(',')
+        else:
+            if kind == 'close':
+                buffer.append(')')
+            else:
+                buffer.append(_newick_label(labels[node] if labels is not None else node))
+            if parent_height is not None:
+                buffer.append(':' + repr(parent_height - heights[node]))
+        if len(buffer) >= buffer_size:
+            f.write(''.join(buffer))
+            buffer = []
+    buffer.append(';\n')
+    f.write(''.join(buffer))
+
+
+def write_json(dendrogram, f, labels=None, inf_distance=None, buffer_size=65536):
+    """
+     Given a dendrogram, write the hierarchy as nested JSON objects, without recursion and by chunks. Each cluster is
+     written as {"id": ..., "distance": ..., "size": ..., "children": [...]} and each node as {"id": ..., "name": ...}.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     f: file
+         Text file where the tree is written.
+     labels: list
+         Label of each node. By default, the index of the node.
+     inf_distance: double
+         Distance replacing the infinite distances of the merges of connected components, as in finite_distances.
+     buffer_size: int
+         Number of tokens written at once.
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    heights = [0.] * n_nodes + finite_distances(dendrogram, inf_distance).tolist()
+    sizes = cluster_sizes(dendrogram).tolist()
+    buffer = []
+    for kind, node, _ in _tokens(dendrogram, inf_distance):
+        if kind == 'open':
+            buffer.append('{{"id": {}, "distance": {}, "size": {}, "children": ['.format(
+                node, json.dumps(heights[node]), sizes[node]))
+        elif kind == 'sep':
+            buffer.append(', ')
+        elif kind == 'close':
+            buffer.append(']}')
+        else:
+            buffer.append('{{"id": {}, "name": {}}}'.format(
+                node, json.dumps(labels[node] if labels is not None else node)))
+        if len(buffer) >= buffer_size:
+            f.write(''.join(buffer))
+            buffer = []
+    buffer.append('\n')
+    f.write(''.join(buffer))
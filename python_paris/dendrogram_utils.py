@@ -0,0 +1,427 @@
+import os
+
+import numpy as np
+
+
+def node_degrees(indptr, indices, data):
+    """
+     Given a graph in CSR format, compute the weight of each node as in paris: the sum of the weights of its edges, a
+     self-loop being counted twice as in the degree of networkx.
+
+     Parameters
+     ----------
+     indptr: numpy.array
+         Index pointers of the CSR adjacency.
+     indices: numpy.array
+         Column indices of the CSR adjacency. A self-loop is a single diagonal entry.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+
+     Returns
+     -------
+     degrees: numpy.array
+         The weight of each node.
+
+     References
+     ----------
+     -
+     """
+    indptr = np.asarray(indptr)
+    n_nodes = len(indptr) - 1
+    rows = np.repeat(np.arange(n_nodes), np.diff(indptr))
+    data = np.asarray(data, dtype=float)
+    loops = rows == np.asarray(indices)
+    return np.bincount(rows, weights=data, minlength=n_nodes) + np.bincount(rows[loops], weights=data[loops],
+                                                                             minlength=n_nodes)
+
+
+def cluster_sizes(dendrogram):
+    """
+     Given a dendrogram, compute the number of nodes of every cluster from the merged nodes.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+
+     Returns
+     -------
+     sizes: numpy.array
+         Number of nodes of each cluster. The n first clusters are the sole nodes, the cluster n+t is the cluster
+         created after t merges.
+
+     References
+     ----------
+     -
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    children = np.asarray(dendrogram)[:, :2].astype(np.int64).tolist()
+    sizes = [1] * n_nodes + [0] * (n_nodes - 1)
+    for t in range(n_nodes - 1):
+        i, j = children[t]
+        sizes[n_nodes + t] = sizes[i] + sizes[j]
+    return np.array(sizes, dtype=np.int64)
+
+
+def leaf_order(dendrogram):
+    """
+     Given a dendrogram, compute an order of the nodes in which every cluster is a contiguous block.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+
+     Returns
+     -------
+     order: numpy.array
+         The nodes, ordered so that the left cluster of each merge comes before the right cluster.
+     offsets: numpy.array
+         Position in the order of the first node of each cluster. The nodes of the cluster c are
+         order[offsets[c]:offsets[c] + sizes[c]].
+
+     References
+     ----------
+     -
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    children = np.asarray(dendrogram)[:, :2].astype(np.int64).tolist()
+    sizes = cluster_sizes(dendrogram).tolist()
+    offsets = [0] * (2 * n_nodes - 1)
+    for t in range(n_nodes - 2, -1, -1):
+        i, j = children[t]
+        offsets[i] = offsets[n_nodes + t]
+        offsets[j] = offsets[n_nodes + t] + sizes[i]
+    offsets = np.array(offsets, dtype=np.int64)
+    order = np.zeros(n_nodes, dtype=np.int64)
+    order[offsets[:n_nodes]] = np.arange(n_nodes)
+    return order, offsets
+
+
+def cluster_weights(dendrogram, node_weights):
+    """
+     Given a dendrogram and the node weights, compute the weight of every cluster.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     node_weights: numpy.array
+         Weight of each node.
+
+     Returns
+     -------
+     weights: numpy.array
+         Sum of the node weights of each cluster, for the 2n-1 clusters of the dendrogram.
+
+     References
+     ----------
+     -
+     """
+    order, offsets = leaf_order(dendrogram)
+    sizes = cluster_sizes(dendrogram)
+    prefix = np.concatenate(([0.], np.cumsum(np.asarray(node_weights, dtype=float)[order])))
+    return prefix[offsets + sizes] - prefix[offsets]
+
+
+def merge_levels(dendrogram, indptr, indices):
+    """
+     Given a dendrogram and a graph in CSR format, compute for every entry of the adjacency the merge at which its two
+     nodes end up in the same cluster. The entries are processed offline in one sweep over the leaf order, in
+     O(m + n) time and memory up to the inverse Ackermann factor of the union-find.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     indptr: numpy.array
+         Index pointers of the CSR adjacency.
+     indices: numpy.array
+         Column indices of the CSR adjacency.
+
+     Returns
+     -------
+     levels: numpy.array
+         For each entry of the adjacency, the index t of the merge that joins its two nodes, or -1 for self-loops.
+
+     References
+     ----------
+     -
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    indptr = np.asarray(indptr)
+    rows = np.repeat(np.arange(n_nodes), np.diff(indptr))
+    levels = -np.ones(len(rows), dtype=np.int64)
+    if n_nodes < 2:
+        return levels
+
+    position, gaps = _leaf_gaps(dendrogram)
+    p = position[rows]
+    q = position[np.asarray(indices)]
+    mask = p != q
+    levels[mask] = _range_maxima(gaps, np.minimum(p, q)[mask], np.maximum(p, q)[mask] - 1)
+    return levels
+
+
+def _leaf_gaps(dendrogram):
+    # Consecutive nodes in the leaf order are separated by the merge of their lowest common ancestor, and the lowest
+    # common ancestor of any two nodes is the latest of the merges separating them.
+    n_nodes = np.shape(dendrogram)[0] + 1
+    order, offsets = leaf_order(dendrogram)
+    sizes = cluster_sizes(dendrogram)
+    left = np.asarray(dendrogram)[:, 0].astype(np.int64)
+    gaps = np.zeros(n_nodes - 1, dtype=np.int64)
+    gaps[offsets[n_nodes:] + sizes[left] - 1] = np.arange(n_nodes - 1)
+    position = np.empty(n_nodes, dtype=np.int64)
+    position[order] = np.arange(n_nodes)
+    return position, gaps
+
+
+def _range_maxima(values, low, high):
+    # Offline maxima of values[low[i]:high[i] + 1] in one sweep from left to right, in O(n + m) up to the inverse
+    # Ackermann factor and O(n + m) memory. Each position points to the next larger value seen so far (union-find
+    # with path halving), so that the root of low is the position of the maximum of the range ending at the sweep.
+    n = len(values)
+    index = np.argsort(high, kind='stable')
+    starts = np.concatenate(([0], np.cumsum(np.bincount(high, minlength=n)))).tolist()
+    low = np.asarray(low)[index].tolist()
+    values = values.tolist()
+    parent = list(range(n))
+    stack = []
+    maxima = [0] * len(low)
+    for r in range(n):
+        value = values[r]
+        while stack and values[stack[-1]] < value:
+            parent[stack.pop()] = r
+        stack.append(r)
+        for k in range(starts[r], starts[r + 1]):
+            x = low[k]
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            maxima[k] = values[x]
+    result = np.empty(len(maxima), dtype=np.int64)
+    result[index] = maxima
+    return result
+
+
+def _lca_table(dendrogram):
+    # Sparse table of the range maxima of the leaf gaps, for online queries of lowest common ancestors in O(1): it
+    # takes O(n log n) time and memory (about log2(n) arrays of n integers).
+    n_nodes = np.shape(dendrogram)[0] + 1
+    position, gaps = _leaf_gaps(dendrogram)
+    table = [gaps.astype(np.int32) if n_nodes < 2 ** 31 else gaps]
+    span = 1
+    while 2 * span <= n_nodes - 1:
+        table.append(np.maximum(table[-1][:-span], table[-1][span:]))
+        span *= 2
+    return position, table
+
+
+def _lca_query(table, low, high):
+    # Merge of the lowest common ancestor of the nodes at positions low < high of the leaf order.
+    k = np.floor(np.log2(high - low)).astype(np.int64)
+    result = np.empty(len(low), dtype=np.int64)
+    for j in np.unique(k):
+        selection = k == j
+        result[selection] = np.maximum(table[j][low[selection]], table[j][high[selection] - 2 ** j])
+    return result
+
+
+def merge_weights(dendrogram, indptr, indices, data):
+    """
+     Given a dendrogram and a graph in CSR format, compute the weight between the two clusters merged at each merge.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     indptr: numpy.array
+         Index pointers of the CSR adjacency.
+     indices: numpy.array
+         Column indices of the CSR adjacency. The adjacency must be symmetric.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+
+     Returns
+     -------
+     weights: numpy.array
+         For each merge t, the sum of the entries of the adjacency between the two merged clusters, in both
+         directions.
+     self_weight: double
+         Sum of the diagonal entries of the adjacency.
+
+     References
+     ----------
+     -
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    levels = merge_levels(dendrogram, indptr, indices)
+    data = np.asarray(data, dtype=float)
+    mask = levels >= 0
+    weights = np.bincount(levels[mask], weights=data[mask], minlength=n_nodes - 1)
+    return weights, float(np.sum(data[~mask]))
+
+
+def homogeneous_cut_weights(dendrogram, indptr, indices, data, node_weights=None):
+    """
+     Given a dendrogram and the graph it comes from, compute the weights needed to evaluate the modularity of every
+     homogeneous cut, by walking the merges once.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     indptr: numpy.array
+         Index pointers of the CSR adjacency.
+     indices: numpy.array
+         Column indices of the CSR adjacency. The adjacency must be symmetric.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+     node_weights: numpy.array
+         Weight of each node. By default, its degree with the self-loops counted twice, as in paris (see
+         node_degrees).
+
+     Returns
+     -------
+     internal: numpy.array
+         For each cut level t from 0 to n - 1, the total weight inside the clusters of the partition, each edge being
+         counted in both directions (a self-loop twice, as in its degree).
+     squares: numpy.array
+         For each cut level t from 0 to n - 1, the sum of the squared weights of the clusters of the partition.
+     wtot: double
+         Total weight of the nodes.
+
+     References
+     ----------
+     -
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    if node_weights is None:
+        node_weights = node_degrees(indptr, indices, data)
+    node_weights = np.asarray(node_weights, dtype=float)
+
+    weights, self_weight = merge_weights(dendrogram, indptr, indices, data)
+    internal = np.concatenate(([2 * self_weight], 2 * self_weight + np.cumsum(weights)))
+    w = cluster_weights(dendrogram, node_weights)
+    children = np.asarray(dendrogram)[:, :2].astype(np.int64)
+    squares = np.sum(node_weights ** 2) + np.concatenate(([0.], np.cumsum(2 * w[children[:, 0]] * w[children[:, 1]])))
+    return internal, squares, float(np.sum(node_weights))
+
+
+def cluster_internal_weights(dendrogram, indptr, indices, data):
+    """
+     Given a dendrogram and the graph it comes from, compute the weight inside every cluster.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     indptr: numpy.array
+         Index pointers of the CSR adjacency.
+     indices: numpy.array
+         Column indices of the CSR adjacency. The adjacency must be symmetric.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+
+     Returns
+     -------
+     internal: numpy.array
+         Sum of the entries of the adjacency inside each cluster, for the 2n-1 clusters of the dendrogram.
+
+     References
+     ----------
+     -
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    indptr = np.asarray(indptr)
+    rows = np.repeat(np.arange(n_nodes), np.diff(indptr))
+    data = np.asarray(data, dtype=float)
+    loops = rows == np.asarray(indices)
+    self_weights = np.bincount(rows[loops], weights=data[loops], minlength=n_nodes)
+    weights, _ = merge_weights(dendrogram, indptr, indices, data)
+
+    # The merges inside a cluster are the gaps between its consecutive nodes in the leaf order.
+    order, offsets = leaf_order(dendrogram)
+    sizes = cluster_sizes(dendrogram)
+    left = np.asarray(dendrogram)[:, 0].astype(np.int64)
+    gap_weights = np.zeros(max(n_nodes - 1, 0))
+    gap_weights[offsets[n_nodes:] + sizes[left] - 1] = weights
+    node_prefix = np.concatenate(([0.], np.cumsum(self_weights[order])))
+    gap_prefix = np.concatenate(([0.], np.cumsum(gap_weights)))
+    return node_prefix[offsets + sizes] - node_prefix[offsets] + gap_prefix[offsets + sizes - 1] - gap_prefix[offsets]
+
+
+def sharp_score(w, x, y):
+    """
+     Default score of the slicers for a cluster of w nodes created at the distance y and merged at the distance x:
+     w * log(x / y). It is a module-level function, so that it can be sent to a pool of processes.
+     """
+    return w * (np.log(x) - np.log(y))
+
+
+def _score_chunk(scoring, triples):
+    return [scoring(w, x, y) if y > 0. else 0. for w, x, y in triples]
+
+
+def merge_scores(dendrogram, scoring, n_jobs=1, backend='thread', chunk_size=None):
+    """
+     Given a dendrogram and a scoring function, compute the score of the two clusters merged at each merge, from their
+     number of nodes, their creation distance and the distance of the merge. The scorer calls are independent and can
+     be run by chunks in a pool of threads or processes; the scores are returned in the same order in any case.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     scoring: function
+         Function that computes the score of a cluster thanks to its number of nodes (w), its creation distance (x) and
+         its merged distance (y). It must be picklable (e.g. a module-level function) with the process backend.
+     n_jobs: int
+         Number of workers. 1 scores in the current thread, -1 uses one worker per CPU.
+     backend: str
+         'thread' or 'process'. Threads help when the scoring function releases the GIL (numpy, I/O), processes
+         otherwise.
+     chunk_size: int
+         Number of clusters scored by a worker at once. By default, about 4 chunks per worker.
+
+     Returns
+     -------
+     scores: list of double
+         The score of the left and right clusters of each merge, in the order of the merges: scores[2t] and
+         scores[2t + 1] for the merge t. The score of a sole node is 0.
+
+     References
+     ----------
+     -
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    children = np.asarray(dendrogram)[:, :2].astype(np.int64).ravel().tolist()
+    triples = []
+    for k, c in enumerate(children):
+        if c < n_nodes:
+            triples.append((1, dendrogram[k // 2, 2], 0.))
+        else:
+            triples.append((dendrogram[c - n_nodes, 3], dendrogram[k // 2, 2], dendrogram[c - n_nodes, 2]))
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs < 1 or backend not in ('thread', 'process'):
+        raise ValueError
+    if n_jobs == 1 or len(triples) == 0:
+        return _score_chunk(scoring, triples)
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(triples) // (4 * n_jobs)))
+    chunks = [triples[i:i + chunk_size] for i in range(0, len(triples), chunk_size)]
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+    executor_class = ThreadPoolExecutor if backend == 'thread' else ProcessPoolExecutor
+    with executor_class(max_workers=n_jobs) as executor:
+        results = executor.map(_score_chunk, [scoring] * len(chunks), chunks)
+        return [score for result in results for score in result]
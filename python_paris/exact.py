@@ -0,0 +1,213 @@
+import time
+
+import numpy as np
+
+
+def exact_values(values):
+    """
+     Convert floating-point values to integers with a common scale, so that their sums are exact whatever the order of
+     the additions.
+
+     Parameters
+     ----------
+     values: numpy.array
+         The values.
+
+     Returns
+     -------
+     integers: list of int
+         The values times the scale, as Python integers.
+     scale: int
+         A power of 2 such that every value is integers[i] / scale exactly.
+     """
+    values = np.asarray(values, dtype=float)
+    if not np.all(np.isfinite(values)):
+        raise ValueError
+    if np.all(values == np.floor(values)) and np.all(np.abs(values) < 2 ** 53):
+        return values.astype(np.int64).tolist(), 1
+    ratios = [value.as_integer_ratio() for value in values.tolist()]
+    scale = max(q for _, q in ratios)
+    return [p * (scale // q) for p, q in ratios], scale
+
+
+def paris_chain_exact(adjacency, w, wtot, scale, stats=None, callback=None, callback_interval=1000):
+    """
+     Run the nearest-neighbor chain of paris with exact weights and a canonical tie-break, so that the dendrogram does
+     not depend on the order of the nodes, the order of the additions or the order in which the chain visits the
+     clusters.
+
+     The weights are integers with a common scale (see exact_values): the weight between two clusters and the weight
+     of a cluster are exact sums, rounded once to floats to compute the distances. Ties between distances are broken by
+     the smallest node of each cluster, the connected components are joined in the order of their smallest node and the
+     merges are ordered by distance, size and smallest node.
+
+     Parameters
+     ----------
+     adjacency: dict of dict
+         The weight of the edge between the nodes u and v is adjacency[u][v], an integer. Nodes are labeled from 0 to
+         n-1 and inserted in increasing order. There are no self-loops.
+     w: dict
+         Weight of each node, an integer.
+     wtot: int
+         Total weight of the nodes.
+     scale: int
+         Common scale of the integer weights.
+     stats: ParisStats
+         If given, filled with the wall time of the 'chain', 'join' and 'reorder' phases and the counters of the chain.
+     callback: function
+         If given, called every callback_interval merges with the number of merges done, the number of active
+         clusters and the elapsed time in seconds.
+     callback_interval: int
+         Number of merges between two calls of the callback.
+
+     Returns
+     -------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster. The lines are sorted in the canonical order.
+
+     References
+     ----------
+     -
+     """
+    n_nodes = len(adjacency)
+    n_leaves = n_nodes
+    weights = {u: {v: (x, x / scale) for v, x in neighbors.items()} for u, neighbors in adjacency.items()}
+    w_float = {u: x / scale for u, x in w.items()}
+    wtot_float = wtot / scale
+    s = {u: 1 for u in adjacency}
+    m = {u: u for u in adjacency}
+    cc = []
+    dendrogram = []
+    min_leaves = []
+    chain = []
+    u = n_nodes
+    timed = stats is not None
+    chain_steps = 0
+    neighbor_scans = 0
+    max_chain_length = 1
+    start = time.perf_counter()
+
+    while n_nodes > 0:
+        if chain == []:
+            chain = [next(iter(weights))]
+        while chain != []:
+            a = chain.pop()
+            d_min = float("inf")
+            b = -1
+            m_b = n_leaves
+            neighbors_a = weights[a]
+            w_a = w_float[a]
+            chain_steps += 1
+            neighbor_scans += len(neighbors_a)
+            for v in neighbors_a:
+                d = w_float[v] * w_a / neighbors_a[v][1] / wtot_float
+                if d < d_min or (d == d_min and m[v] < m_b):
+                    b = v
+                    d_min = d
+                    m_b = m[v]
+            d = d_min
+            if chain != []:
+                c = chain.pop()
+                if b == c:
+                    dendrogram.append([a, b, d, s[a] + s[b]])
+                    neighbors_u = weights.pop(a)
+                    neighbors_b = weights.pop(b)
+                    neighbors_u.pop(b)
+                    for v in neighbors_b:
+                        if v == a:
+                            continue
+                        if v in neighbors_u:
+                            x = neighbors_u[v][0] + neighbors_b[v][0]
+                            neighbors_u[v] = (x, x / scale)
+                        else:
+                            neighbors_u[v] = neighbors_b[v]
+                    for v in neighbors_u:
+                        neighbors_v = weights[v]
+                        neighbors_v.pop(a, None)
+                        neighbors_v.pop(b, None)
+                        neighbors_v[u] = neighbors_u[v]
+                    weights[u] = neighbors_u
+                    n_nodes -= 1
+                    w[u] = w.pop(a) + w.pop(b)
+                    w_float.pop(a)
+                    w_float.pop(b)
+                    w_float[u] = w[u] / scale
+                    s[u] = s.pop(a) + s.pop(b)
+                    m[u] = min(m.pop(a), m.pop(b))
+                    min_leaves.append(m[u])
+                    u += 1
+                    if callback is not None and len(dendrogram) % callback_interval == 0:
+                        callback(len(dendrogram), n_nodes + len(cc), time.perf_counter() - start)
+                else:
+                    chain.append(c)
+                    chain.append(a)
+                    chain.append(b)
+                    max_chain_length = max(max_chain_length, len(chain))
+            elif b >= 0:
+                chain.append(a)
+                chain.append(b)
+                max_chain_length = max(max_chain_length, len(chain))
+            else:
+                cc.append((m[a], a, s[a]))
+                weights.pop(a)
+                n_nodes -= 1
+
+    if timed:
+        stats.times['chain'] = time.perf_counter() - start
+        stats.chain_steps = chain_steps
+        stats.neighbor_scans = neighbor_scans
+        stats.max_chain_length = max_chain_length
+        stats.merges = len(dendrogram)
+        stats.components = len(cc)
+        start = time.perf_counter()
+
+    cc.sort()
+    m_a, a, size = cc[0]
+    for m_b, b, t in cc[1:]:
+        size += t
+        dendrogram.append([a, b, float("inf"), size])
+        min_leaves.append(m_a)
+        a = u
+        u += 1
+
+    if timed:
+        stats.times['join'] = time.perf_counter() - start
+        start = time.perf_counter()
+    dendrogram = canonical_dendrogram(np.array(dendrogram, dtype=float).reshape(-1, 4), min_leaves)
+    if timed:
+        stats.times['reorder'] = time.perf_counter() - start
+    return dendrogram
+
+
+def canonical_dendrogram(dendrogram, min_leaves):
+    """
+     Given a dendrogram whose lines are in the order of creation of the clusters, sort the lines by distance, size and
+     smallest node of the new cluster, and put the child with the smallest node first in each line. The order does not
+     depend on the order in which the merges were found.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     min_leaves: list of int
+         Smallest node of the cluster created by each line.
+
+     Returns
+     -------
+     dendrogram: numpy.array
+         The dendrogram in the canonical order.
+     """
+    n = np.shape(dendrogram)[0] + 1
+    min_leaves = np.asarray(min_leaves, dtype=np.int64)
+    index = np.lexsort((min_leaves, dendrogram[:, 3], dendrogram[:, 2]))
+    n_index = np.arange(2 * n - 1)
+    n_index[n + index] = n + np.arange(n - 1)
+    all_min_leaves = np.concatenate((np.arange(n), min_leaves))
+    reordered = dendrogram[index, :]
+    children = reordered[:, :2].astype(np.int64)
+    swap = all_min_leaves[children[:, 0]] > all_min_leaves[children[:, 1]]
+    children[swap] = children[swap][:, ::-1]
+    reordered[:, :2] = n_index[children]
+    return reordered
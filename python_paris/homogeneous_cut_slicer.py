@@ -1,4 +1,5 @@
 import numpy as np
+from .dendrogram_utils import homogeneous_cut_weights, merge_scores, sharp_score
 
 
 def clustering_from_homogeneous_cut(dendrogram, cut):
@@ -45,7 +46,7 @@ class ClusterTree:
         self.right = None
 
 
-def best_homogeneous_cut(dendrogram, scoring=lambda w, x, y: w * (np.log(x) - np.log(y))):
+def best_homogeneous_cut(dendrogram, scoring=sharp_score):
     """
      Given a dendrogram and a scoring function, compute the homogeneous cut level with the best average cluster score
      with respect to the scoring function.
@@ -111,7 +112,7 @@ def best_homogeneous_cut(dendrogram, scoring=lambda w, x, y: w * (np.log(x) - np
     return best_cut, best_score
 
 
-def ranking_homogeneous_cuts(dendrogram, scoring=lambda w, x, y: w * (np.log(x) - np.log(y))):
+def ranking_homogeneous_cuts(dendrogram, scoring=sharp_score, n_jobs=1, backend='thread'):
     """
      Given a dendrogram and a scoring function, compute the ranking of the homogeneous cut level with the best average
      cluster score with respect to the scoring function.
@@ -124,6 +125,10 @@ def ranking_homogeneous_cuts(dendrogram, scoring=lambda w, x, y: w * (np.log(x)
      scoring: function
          Function that computes the score of a cluster thanks to its number of nodes (w), its creation distance (x) and
          its merged distance.
+     n_jobs: int
+         Number of workers scoring the clusters, as in merge_scores. The ranking does not depend on it.
+     backend: str
+         'thread' or 'process' pool of workers, as in merge_scores.
 
      Returns
      -------
@@ -139,6 +144,7 @@ def ranking_homogeneous_cuts(dendrogram, scoring=lambda w, x, y: w * (np.log(x)
      -
      """
     n_nodes = np.shape(dendrogram)[0] + 1
+    scores = merge_scores(dendrogram, scoring, n_jobs=n_jobs, backend=backend)
     cluster_trees = {t: ClusterTree(t, 0., 1, 0.) for t in range(n_nodes)}
     for t in range(n_nodes - 1):
         i = int(dendrogram[t][0])
@@ -149,15 +155,8 @@ def ranking_homogeneous_cuts(dendrogram, scoring=lambda w, x, y: w * (np.log(x)
         new_distance = dendrogram[t, 2]
         new_size = dendrogram[t, 3]
 
-        if left_tree.distance > 0.:
-            left_tree.score = scoring(left_tree.size, new_distance, left_tree.distance)
-        else:
-            left_tree.score = 0.
-
-        if right_tree.distance > 0.:
-            right_tree.score = scoring(right_tree.size, new_distance, right_tree.distance)
-        else:
-            right_tree.score = 0.
+        left_tree.score = scores[2 * t]
+        right_tree.score = scores[2 * t + 1]
 
         new_tree = ClusterTree(n_nodes + t, new_distance, new_size, left_tree.score + right_tree.score)
         new_tree.left = left_tree
@@ -175,3 +174,39 @@ def ranking_homogeneous_cuts(dendrogram, scoring=lambda w, x, y: w * (np.log(x)
     ranked_cut_scores = sorted(list(cut_scores.values()), reverse=True)
 
     return ranked_cuts, ranked_cut_scores
+
+
+def modularity_homogeneous_cuts(dendrogram, indptr, indices, data, node_weights=None, resolution=1.):
+    """
+     Given a dendrogram and the graph it comes from, compute the modularity of every homogeneous cut level in one walk
+     through the merges.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     indptr: numpy.array
+         Index pointers of the CSR adjacency of the graph.
+     indices: numpy.array
+         Column indices of the CSR adjacency. The adjacency must be symmetric.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+     node_weights: numpy.array
+         Weight of each node. By default, its degree with the self-loops counted twice, as in paris (see
+         node_degrees).
+     resolution: double
+         Resolution r of the modularity sum_C (r * p(C, C) - p(C)^2).
+
+     Returns
+     -------
+     modularities: numpy.array
+         The modularity of the partition of each cut level. The cut level can go from 0 to n - 1 with n the number of
+         nodes. The cut t is the partition created after t merges.
+
+     References
+     ----------
+     -
+     """
+    internal, squares, wtot = homogeneous_cut_weights(dendrogram, indptr, indices, data, node_weights=node_weights)
+    return resolution * internal / wtot - squares / wtot ** 2
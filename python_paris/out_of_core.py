@@ -0,0 +1,296 @@
+import os
+import shutil
+import tempfile
+
+import numpy as np
+from .paris import reorder_dendrogram
+
+# Estimated memory of the in-memory adjacency of the active clusters, in bytes.
+ENTRY_BYTES = 100
+CLUSTER_BYTES = 300
+SPILLED_BYTES = 150
+
+RAW = 0
+ACTIVE = 1
+SPILLED = 2
+DEAD = 3
+
+
+def save_csr(directory, indptr, indices, data):
+    """
+     Save a graph in CSR format as .npy files that paris_out_of_core can memory-map.
+
+     Parameters
+     ----------
+     directory: str
+         Directory of the files. It is created if needed.
+     indptr: numpy.array
+         Index pointers of the CSR adjacency.
+     indices: numpy.array
+         Column indices of the CSR adjacency. The adjacency must be symmetric.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+     """
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+    np.save(os.path.join(directory, 'indptr.npy'), np.asarray(indptr, dtype=np.int64))
+    np.save(os.path.join(directory, 'indices.npy'), np.asarray(indices, dtype=np.int64))
+    np.save(os.path.join(directory, 'data.npy'), np.asarray(data, dtype=float))
+
+
+def load_csr(directory, mmap_mode='r'):
+    """
+     Load a graph in CSR format saved by save_csr.
+
+     Parameters
+     ----------
+     directory: str
+         Directory of the files.
+     mmap_mode: str
+         Memory-map mode of numpy.load. By default, the arrays are memory-mapped read-only.
+
+     Returns
+     -------
+     indptr: numpy.array
+         Index pointers of the CSR adjacency.
+     indices: numpy.array
+         Column indices of the CSR adjacency.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+     """
+    return tuple(np.load(os.path.join(directory, name + '.npy'), mmap_mode=mmap_mode)
+                 for name in ('indptr', 'indices', 'data'))
+
+
+def paris_out_of_core(directory, memory_budget=2 ** 30, work_directory=None, dendrogram_path=None,
+                      chunk_size=2 ** 20):
+    """
+     Given a graph saved by save_csr, compute the paris hierarchy with a bounded memory for the adjacency of the active
+     clusters.
+
+     The CSR adjacency stays in memory-mapped files and the adjacency of a node is only read when the chain reaches
+     it. When the estimated memory of the active adjacency exceeds the budget, the largest clusters out of the chain
+     are spilled to disk segments and read back when the chain reaches them again. The node weights, sizes and
+     union-find parents live in memory-mapped files of the work directory, and the merges are appended to a file.
+
+     Parameters
+     ----------
+     directory: str
+         Directory of the graph, as written by save_csr.
+     memory_budget: int
+         Budget in bytes for the adjacency of the active clusters. MemoryError is raised if the chain alone does not
+         fit in the budget. The budget does not cover the returned dendrogram: at the end of the run, the merges are
+         read back and sorted by reorder_dendrogram in memory, which takes about 140 bytes per node at its peak.
+     work_directory: str
+         Directory of the memory-mapped arrays, spill segments and merge log. By default, a temporary directory
+         removed at the end of the run.
+     dendrogram_path: str
+         If given, the dendrogram is also saved to this .npy file.
+     chunk_size: int
+         Number of nodes processed at once when the arrays are initialized.
+
+     Returns
+     -------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster. It is the dendrogram of paris_csr, up to the rounding of the aggregated weights.
+
+     References
+     ----------
+     -
+     """
+    indptr, indices, data = load_csr(directory)
+    n_nodes = len(indptr) - 1
+    temporary = work_directory is None
+    if temporary:
+        work_directory = tempfile.mkdtemp()
+    elif not os.path.isdir(work_directory):
+        os.makedirs(work_directory)
+
+    try:
+        open_memmap = np.lib.format.open_memmap
+        w = open_memmap(os.path.join(work_directory, 'w.npy'), mode='w+', dtype=float, shape=(2 * n_nodes - 1,))
+        s = open_memmap(os.path.join(work_directory, 's.npy'), mode='w+', dtype=np.int64, shape=(2 * n_nodes - 1,))
+        parent = open_memmap(os.path.join(work_directory, 'parent.npy'), mode='w+', dtype=np.int64,
+                             shape=(2 * n_nodes - 1,))
+        status = open_memmap(os.path.join(work_directory, 'status.npy'), mode='w+', dtype=np.uint8,
+                             shape=(2 * n_nodes - 1,))
+        wtot = 0.
+        for i in range(0, n_nodes, chunk_size):
+            j = min(i + chunk_size, n_nodes)
+            segment = np.concatenate(([0.], np.cumsum(data[indptr[i]:indptr[j]])))
+            w[i:j] = segment[indptr[i + 1:j + 1] - indptr[i]] - segment[indptr[i:j] - indptr[i]]
+            # A self-loop counts twice in the weight of its node, as in paris_csr.
+            rows = np.repeat(np.arange(i, j), np.diff(indptr[i:j + 1]))
+            loops = indices[indptr[i]:indptr[j]] == rows
+            w[i:j] += np.bincount(rows[loops] - i, weights=data[indptr[i]:indptr[j]][loops], minlength=j - i)
+            wtot += float(np.sum(w[i:j]))
+            s[i:j] = 1
+            parent[i:j] = np.arange(i, j)
+        parent[n_nodes:] = np.arange(n_nodes, 2 * n_nodes - 1)
+
+        with open(os.path.join(work_directory, 'spill.bin'), 'w+b') as spill_file, \
+                open(os.path.join(work_directory, 'merges.bin'), 'w+b') as merge_file:
+            cc, u = _out_of_core_chain(indptr, indices, data, w, s, parent, status, wtot, memory_budget,
+                                       spill_file, merge_file)
+            rows = []
+            if cc:
+                a, size = cc.pop()
+                for b, t in cc:
+                    size += t
+                    rows.append([a, b, float("inf"), size])
+                    a = u
+                    u += 1
+            np.array(rows, dtype=float).tofile(merge_file)
+            merge_file.flush()
+
+        merges = np.fromfile(os.path.join(work_directory, 'merges.bin'), dtype=float).reshape(-1, 4)
+        dendrogram = reorder_dendrogram(merges)
+        del w, s, parent, status
+    finally:
+        if temporary:
+            shutil.rmtree(work_directory, ignore_errors=True)
+
+    if dendrogram_path is not None:
+        np.save(dendrogram_path, dendrogram)
+    return dendrogram
+
+
+def _out_of_core_chain(indptr, indices, data, w, s, parent, status, wtot, memory_budget, spill_file, merge_file,
+                       buffer_size=4096):
+    n_nodes = len(indptr) - 1
+    adjacency = {}
+    spilled = {}
+    n_entries = [0]
+    buffer = []
+    cc = []
+    u = n_nodes
+    first = 0
+    n_active = n_nodes
+
+    def find(x):
+        root = x
+        while parent[root] != root:
+            root = int(parent[root])
+        while x != root:
+            next_x = int(parent[x])
+            parent[x] = root
+            x = next_x
+        return root
+
+    def materialize(x):
+        if x in adjacency:
+            return adjacency[x]
+        if x in spilled:
+            offset, count = spilled.pop(x)
+            spill_file.seek(offset)
+            keys = np.fromfile(spill_file, dtype=np.int64, count=count).tolist()
+            values = np.fromfile(spill_file, dtype=float, count=count).tolist()
+        else:
+            keys = indices[indptr[x]:indptr[x + 1]].tolist()
+            values = data[indptr[x]:indptr[x + 1]].tolist()
+        neighbors = {}
+        for j, value in zip(keys, values):
+            c = find(j)
+            if c != x:
+                if c in neighbors:
+                    neighbors[c] += value
+                else:
+                    neighbors[c] = value
+        adjacency[x] = neighbors
+        status[x] = ACTIVE
+        n_entries[0] += len(neighbors)
+        return neighbors
+
+    def memory():
+        return n_entries[0] * ENTRY_BYTES + len(adjacency) * CLUSTER_BYTES + len(spilled) * SPILLED_BYTES
+
+    def spill(protected):
+        candidates = sorted((x for x in adjacency if x not in protected), key=lambda x: -len(adjacency[x]))
+        for x in candidates:
+            if memory() <= 0.75 * memory_budget:
+                break
+            neighbors = adjacency.pop(x)
+            spill_file.seek(0, 2)
+            spilled[x] = (spill_file.tell(), len(neighbors))
+            np.fromiter(neighbors.keys(), dtype=np.int64, count=len(neighbors)).tofile(spill_file)
+            np.fromiter(neighbors.values(), dtype=float, count=len(neighbors)).tofile(spill_file)
+            status[x] = SPILLED
+            n_entries[0] -= len(neighbors)
+        if memory() > memory_budget:
+            raise MemoryError('the chain of paris does not fit in the memory budget')
+
+    while n_active > 0:
+        while status[first] == DEAD:
+            first += 1
+        chain = [first]
+        while chain != []:
+            a = chain.pop()
+            neighbors_a = materialize(a)
+            if memory() > memory_budget:
+                spill(set(chain) | {a})
+            w_a = float(w[a])
+            d_min = float("inf")
+            b = -1
+            for v in neighbors_a:
+                d = float(w[v]) * w_a / float(neighbors_a[v]) / float(wtot)
+                if d < d_min:
+                    b = v
+                    d_min = d
+                elif d == d_min:
+                    b = min(b, v)
+            d = d_min
+            if chain != []:
+                c = chain.pop()
+                if b == c:
+                    buffer.append([a, b, d, s[a] + s[b]])
+                    if len(buffer) >= buffer_size:
+                        np.array(buffer, dtype=float).tofile(merge_file)
+                        buffer = []
+                    neighbors_u = adjacency.pop(a)
+                    neighbors_b = adjacency.pop(b)
+                    n_entries[0] -= len(neighbors_u) + len(neighbors_b)
+                    neighbors_u.pop(b, None)
+                    for v in neighbors_b:
+                        if v == a:
+                            continue
+                        if v in neighbors_u:
+                            neighbors_u[v] += neighbors_b[v]
+                        else:
+                            neighbors_u[v] = neighbors_b[v]
+                    for v in neighbors_u:
+                        if v in adjacency:
+                            neighbors_v = adjacency[v]
+                            size = len(neighbors_v)
+                            neighbors_v.pop(a, None)
+                            neighbors_v.pop(b, None)
+                            neighbors_v[u] = neighbors_u[v]
+                            n_entries[0] += len(neighbors_v) - size
+                    adjacency[u] = neighbors_u
+                    n_entries[0] += len(neighbors_u)
+                    status[a] = DEAD
+                    status[b] = DEAD
+                    status[u] = ACTIVE
+                    parent[a] = u
+                    parent[b] = u
+                    n_active -= 1
+                    w[u] = w[a] + w[b]
+                    s[u] = s[a] + s[b]
+                    u += 1
+                    if memory() > memory_budget:
+                        spill(set(chain))
+                else:
+                    chain.append(c)
+                    chain.append(a)
+                    chain.append(b)
+            elif b >= 0:
+                chain.append(a)
+                chain.append(b)
+            else:
+                cc.append((a, int(s[a])))
+                n_entries[0] -= len(adjacency.pop(a))
+                status[a] = DEAD
+                n_active -= 1
+
+    np.array(buffer, dtype=float).tofile(merge_file)
+    return cc, u
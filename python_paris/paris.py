@@ -1,8 +1,66 @@
+import pickle
+import time
+
 import numpy as np
-import networkx as nx
+from .exact import exact_values, paris_chain_exact
+from .dendrogram_utils import node_degrees
+
+__all__ = ['paris', 'paris_csr', 'resume_paris', 'save_checkpoint', 'load_checkpoint', 'paris_chain',
+           'reorder_dendrogram', 'ParisStats', 'CancellationToken', 'ParisCheckpoint', 'ParisCancelled']
 
 
-def paris(graph):
+class ParisStats:
+    """
+     Instrumentation of a run of paris: wall time of each phase in seconds and counters of the nearest-neighbor chain.
+     """
+    def __init__(self):
+        self.times = {}
+        self.chain_steps = 0
+        self.neighbor_scans = 0
+        self.max_chain_length = 0
+        self.merges = 0
+        self.components = 0
+
+
+class CancellationToken:
+    """
+     Cooperative cancellation of a run of paris. The nearest-neighbor chain checks the token at each step and raises
+     ParisCancelled once cancel has been called, e.g. from another thread or a signal handler.
+     """
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class ParisCheckpoint:
+    """
+     Partial state of a run of paris: the dendrogram so far, the node weights w and sizes s of the active clusters, the
+     remaining graph and the current chain. A checkpoint can be pickled and resumed with resume_paris.
+     """
+    def __init__(self, adjacency, w, s, wtot, dendrogram, cc, chain, u, elapsed):
+        self.adjacency = adjacency
+        self.w = w
+        self.s = s
+        self.wtot = wtot
+        self.dendrogram = dendrogram
+        self.cc = cc
+        self.chain = chain
+        self.u = u
+        self.elapsed = elapsed
+
+
+class ParisCancelled(Exception):
+    """
+     Raised when a run of paris is cancelled. The checkpoint attribute holds the state needed to resume the run.
+     """
+    def __init__(self, checkpoint):
+        Exception.__init__(self, 'paris cancelled after {} merges'.format(len(checkpoint.dendrogram)))
+        self.checkpoint = checkpoint
+
+
+def paris(graph, return_stats=False, callback=None, callback_interval=1000, cancel=None, deterministic=False):
     """
      Given a graph, compute the paris hierarchy.
 
@@ -10,47 +68,382 @@ def paris(graph):
      ----------
      dendrogram: networkx.graph
          A graph with weighted edges.
+     return_stats: bool
+         If True, also return a ParisStats object with the wall time of each phase ('labels', 'copy', 'weights',
+         'chain', 'merge', 'join', 'reorder') and the counters of the nearest-neighbor chain.
+     callback: function
+         If given, called every callback_interval merges with the number of merges done, the number of active
+         clusters and the elapsed time in seconds.
+     callback_interval: int
+         Number of merges between two calls of the callback.
+     cancel: CancellationToken
+         If given and cancelled during the run, ParisCancelled is raised with a checkpoint of the partial state.
+     deterministic: bool
+         If True, the weights are summed exactly and ties are broken canonically (see paris_chain_exact), so that the
+         dendrogram is reproducible bit for bit by any implementation, whatever its order of operations. The run
+         cannot be cancelled in this mode.
 
      Returns
      -------
      dendrogram: numpy.array
          The paris hierachical clustering is represneted by the dendrogram. Each line of the dendrogram contains the
          merged nodes, the distance between merged nodes and the number of nodes in the new cluster.
+     stats: ParisStats
+         Only if return_stats is True.
 
      References
      ----------
      -
      """
-    graph_copy = graph.copy()
-    nodes = list(graph_copy.nodes())
+    import networkx as nx
+
+    if deterministic and cancel is not None:
+        raise ValueError
+    stats = ParisStats() if return_stats else None
+    start = time.perf_counter()
+    nodes = list(graph.nodes())
     n_nodes = len(nodes)
-    graph_copy = nx.convert_node_labels_to_integers(graph_copy)
-    if nx.get_edge_attributes(graph_copy, 'weight') == {}:
-        for u, v in graph_copy.edges():
-            graph_copy.add_edge(u, v, weight=1)
+    index = {node: i for i, node in enumerate(nodes)}
+    weighted = nx.get_edge_attributes(graph, 'weight') != {}
+    if stats is not None:
+        stats.times['labels'] = time.perf_counter() - start
+
+    if deterministic:
+        # The exact weights need all the edge weights first (common scale), so the adjacency is built afterwards.
+        start = time.perf_counter()
+        ends = []
+        values = []
+        for (i, j, data) in graph.edges(data=True):
+            ends.append((index[i], index[j]))
+            values.append(data['weight'] if weighted else 1)
+        if stats is not None:
+            stats.times['copy'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        weights, scale = exact_values(values)
+        del values
+        adjacency = {u: {} for u in range(n_nodes)}
+        w = {u: 0 for u in range(n_nodes)}
+        for (u, v), weight in zip(ends, weights):
+            if u != v:
+                adjacency[u][v] = weight
+                adjacency[v][u] = weight
+            w[u] += weight
+            w[v] += weight
+        del ends, weights
+        if stats is not None:
+            stats.times['weights'] = time.perf_counter() - start
+        dendrogram = paris_chain_exact(adjacency, w, sum(w.values()), scale, stats=stats, callback=callback,
+                                       callback_interval=callback_interval)
+        return (dendrogram, stats) if stats is not None else dendrogram
 
+    # The adjacency and the node weights are built in a single pass over the edges.
+    start = time.perf_counter()
+    adjacency = {u: {} for u in range(n_nodes)}
     w = {u: 0 for u in range(n_nodes)}
     wtot = 0
-    for (u, v) in graph_copy.edges():
-        weight = graph_copy[u][v]['weight']
+    for (i, j, data) in graph.edges(data=True):
+        u = index[i]
+        v = index[j]
+        weight = data['weight'] if weighted else 1
+        adjacency[u][v] = weight
+        adjacency[v][u] = weight
         w[u] += weight
         w[v] += weight
         wtot += 2 * weight
+    if stats is not None:
+        stats.times['copy'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    s = {u: 1 for u in range(n_nodes)}
+    if stats is not None:
+        stats.times['weights'] = time.perf_counter() - start
+
+    dendrogram = paris_chain(adjacency, w, s, wtot, stats=stats, callback=callback,
+                             callback_interval=callback_interval, cancel=cancel)
+
+    start = time.perf_counter()
+    dendrogram = reorder_dendrogram(np.array(dendrogram))
+    if stats is not None:
+        stats.times['reorder'] = time.perf_counter() - start
+        return dendrogram, stats
+    return dendrogram
+
+
+def paris_csr(indptr, indices, data, node_weights=None, self_loops=None, return_stats=False, callback=None,
+              callback_interval=1000, cancel=None, deterministic=False):
+    """
+     Given a graph in compressed sparse row format, compute the paris hierarchy. Node weights and self-loops can be
+     given as arrays, so that aggregated graphs (e.g. the clusters of a previous clustering) can be clustered directly.
+
+     Parameters
+     ----------
+     indptr: numpy.array
+         Index pointers of the CSR adjacency. The neighbors of node i are indices[indptr[i]:indptr[i + 1]].
+     indices: numpy.array
+         Column indices of the CSR adjacency. The adjacency must be symmetric. Diagonal entries are self-loops, and
+         repeated entries are summed.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+     node_weights: numpy.array
+         Weight of each node. By default, the weight of a node is its degree as in paris: the sum of its row in the
+         adjacency with the diagonal entry counted twice, plus twice its entry in self_loops. The node weights are
+         then those of paris on the same graph (e.g. given by networkx.to_scipy_sparse_array), and so is the
+         dendrogram up to the rounding of the sums: the distances may differ in the last bits and merges at nearly
+         equal distances may come in another order.
+     self_loops: numpy.array
+         Additional self-loop weight of each node, e.g. the internal weight of aggregated nodes. Self-loops only
+         contribute to the node weights. Cannot be given with node_weights.
+     return_stats: bool
+         If True, also return a ParisStats object, as in paris.
+     callback: function
+         If given, called every callback_interval merges with the number of merges done, the number of active
+         clusters and the elapsed time in seconds.
+     callback_interval: int
+         Number of merges between two calls of the callback.
+     cancel: CancellationToken
+         If given and cancelled during the run, ParisCancelled is raised with a checkpoint of the partial state.
+     deterministic: bool
+         If True, the weights are summed exactly and ties are broken canonically (see paris_chain_exact), so that the
+         dendrogram is reproducible bit for bit by any implementation, whatever its order of operations. The run
+         cannot be cancelled in this mode.
+
+     Returns
+     -------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     stats: ParisStats
+         Only if return_stats is True.
+
+     References
+     ----------
+     -
+     """
+    if (deterministic and cancel is not None) or (node_weights is not None and self_loops is not None):
+        raise ValueError
+    stats = ParisStats() if return_stats else None
+    start = time.perf_counter()
+    indptr = np.asarray(indptr)
+    n_nodes = len(indptr) - 1
+    rows = np.repeat(np.arange(n_nodes), np.diff(indptr))
+    if deterministic:
+        return _paris_csr_exact(n_nodes, rows, indices, data, node_weights, self_loops, stats, callback,
+                                callback_interval)
+    if node_weights is None:
+        node_weights = node_degrees(indptr, indices, data)
+        if self_loops is not None:
+            node_weights = node_weights + 2 * np.asarray(self_loops, dtype=float)
+    elif len(node_weights) != n_nodes:
+        raise ValueError
+    w = dict(enumerate(np.asarray(node_weights, dtype=float).tolist()))
+    wtot = float(np.sum(node_weights))
     s = {u: 1 for u in range(n_nodes)}
+    if stats is not None:
+        stats.times['weights'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    adjacency = {u: {} for u in range(n_nodes)}
+    for u, v, weight in zip(rows.tolist(), np.asarray(indices).tolist(), np.asarray(data).tolist()):
+        if u != v:
+            adjacency[u][v] = adjacency[u].get(v, 0.) + weight
+    if stats is not None:
+        stats.times['copy'] = time.perf_counter() - start
+
+    dendrogram = paris_chain(adjacency, w, s, wtot, stats=stats, callback=callback,
+                             callback_interval=callback_interval, cancel=cancel)
+
+    start = time.perf_counter()
+    dendrogram = reorder_dendrogram(np.array(dendrogram))
+    if stats is not None:
+        stats.times['reorder'] = time.perf_counter() - start
+        return dendrogram, stats
+    return dendrogram
+
+
+def _paris_csr_exact(n_nodes, rows, indices, data, node_weights, self_loops, stats, callback, callback_interval):
+    start = time.perf_counter()
+    if node_weights is not None and len(node_weights) != n_nodes:
+        raise ValueError
+    n_entries = len(rows)
+    values = [np.asarray(data, dtype=float)]
+    if node_weights is not None:
+        values.append(np.asarray(node_weights, dtype=float))
+    elif self_loops is not None:
+        values.append(np.asarray(self_loops, dtype=float))
+    values, scale = exact_values(np.concatenate(values))
+    adjacency = {u: {} for u in range(n_nodes)}
+    w = {u: 0 for u in range(n_nodes)}
+    for u, v, weight in zip(rows.tolist(), np.asarray(indices).tolist(), values[:n_entries]):
+        if u != v:
+            adjacency[u][v] = adjacency[u].get(v, 0) + weight
+            w[u] += weight
+        else:
+            w[u] += 2 * weight
+    if node_weights is not None:
+        w = dict(enumerate(values[n_entries:]))
+    elif self_loops is not None:
+        for u, weight in enumerate(values[n_entries:]):
+            w[u] += 2 * weight
+    if stats is not None:
+        stats.times['weights'] = time.perf_counter() - start
+    dendrogram = paris_chain_exact(adjacency, w, sum(w.values()), scale, stats=stats, callback=callback,
+                                   callback_interval=callback_interval)
+    return (dendrogram, stats) if stats is not None else dendrogram
+
+
+def resume_paris(checkpoint, return_stats=False, callback=None, callback_interval=1000, cancel=None):
+    """
+     Given the checkpoint of a cancelled run, finish the computation of the paris hierarchy. The checkpoint is modified
+     in place.
+
+     Parameters
+     ----------
+     checkpoint: ParisCheckpoint
+         The checkpoint of the ParisCancelled exception, possibly saved with save_checkpoint and loaded with
+         load_checkpoint.
+     return_stats: bool
+         If True, also return a ParisStats object, as in paris. Only the resumed part of the run is measured.
+     callback: function
+         If given, called every callback_interval merges with the number of merges done, the number of active
+         clusters and the elapsed time in seconds.
+     callback_interval: int
+         Number of merges between two calls of the callback.
+     cancel: CancellationToken
+         If given and cancelled during the run, ParisCancelled is raised with a checkpoint of the partial state.
+
+     Returns
+     -------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster. It is the same dendrogram as the one of the run that was not cancelled.
+     stats: ParisStats
+         Only if return_stats is True.
+
+     References
+     ----------
+     -
+     """
+    stats = ParisStats() if return_stats else None
+    dendrogram = paris_chain(checkpoint.adjacency, checkpoint.w, checkpoint.s, checkpoint.wtot, stats=stats,
+                             callback=callback, callback_interval=callback_interval, cancel=cancel,
+                             checkpoint=checkpoint)
+
+    start = time.perf_counter()
+    dendrogram = reorder_dendrogram(np.array(dendrogram))
+    if stats is not None:
+        stats.times['reorder'] = time.perf_counter() - start
+        return dendrogram, stats
+    return dendrogram
+
+
+def save_checkpoint(checkpoint, path):
+    """
+     Save the checkpoint of a cancelled run of paris to a file.
+
+     Parameters
+     ----------
+     checkpoint: ParisCheckpoint
+         The checkpoint of the ParisCancelled exception.
+     path: str
+         Path of the file.
+     """
+    with open(path, 'wb') as f:
+        pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_checkpoint(path):
+    """
+     Load the checkpoint of a cancelled run of paris from a file written by save_checkpoint.
+
+     Parameters
+     ----------
+     path: str
+         Path of the file.
+
+     Returns
+     -------
+     checkpoint: ParisCheckpoint
+         The checkpoint, to be resumed with resume_paris.
+     """
+    with open(path, 'rb') as f:
+        return pickle.load(f)
+
+
+def paris_chain(adjacency, w, s, wtot, stats=None, callback=None, callback_interval=1000, cancel=None,
+                checkpoint=None):
+    """
+     Run the nearest-neighbor chain of paris on an adjacency of dictionaries. The adjacency, node weights and cluster
+     sizes are modified in place.
+
+     Parameters
+     ----------
+     adjacency: dict of dict
+         The weight of the edge between the nodes u and v is adjacency[u][v]. Nodes are labeled from 0 to n-1. Nodes
+         must be inserted in increasing order; self-loops are ignored.
+     w: dict
+         Weight of each node.
+     s: dict
+         Size of each node.
+     wtot: double
+         Total weight of the nodes.
+     stats: ParisStats
+         If given, filled with the wall time of the 'chain', 'merge' and 'join' phases and the counters of the chain.
+     callback: function
+         If given, called every callback_interval merges with the number of merges done, the number of active
+         clusters and the elapsed time in seconds.
+     callback_interval: int
+         Number of merges between two calls of the callback.
+     cancel: CancellationToken
+         If given and cancelled during the run, ParisCancelled is raised with a checkpoint of the partial state.
+     checkpoint: ParisCheckpoint
+         If given, the run resumes from the dendrogram, components and chain of the checkpoint.
+
+     Returns
+     -------
+     dendrogram: list of list
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster. The lines are not sorted with respect to increasing distances.
+
+     References
+     ----------
+     -
+     """
+    n_nodes = len(adjacency)
     cc = []
     dendrogram = []
+    chain = []
     u = n_nodes
+    elapsed = 0.
+    if checkpoint is not None:
+        cc = checkpoint.cc
+        dendrogram = checkpoint.dendrogram
+        chain = checkpoint.chain
+        u = checkpoint.u
+        elapsed = checkpoint.elapsed
+    timed = stats is not None
+    chain_steps = 0
+    neighbor_scans = 0
+    max_chain_length = 1
+    merge_time = 0.
+    start = time.perf_counter()
 
     while n_nodes > 0:
-        chain = [list(graph_copy.nodes())[0]]
+        if chain == []:
+            chain = [next(iter(adjacency))]
         while chain != []:
+            if cancel is not None and cancel.cancelled:
+                raise ParisCancelled(ParisCheckpoint(adjacency, w, s, wtot, dendrogram, cc, chain, u,
+                                                     elapsed + time.perf_counter() - start))
             a = chain.pop()
             d_min = float("inf")
             b = -1
-            neighbors_a = list(graph_copy.neighbors(a))
+            neighbors_a = adjacency[a]
+            chain_steps += 1
+            neighbor_scans += len(neighbors_a)
             for v in neighbors_a:
                 if v != a:
-                    d = w[v] * w[a] / float(graph_copy[a][v]['weight']) / float(wtot)
+                    d = w[v] * w[a] / float(neighbors_a[v]) / float(wtot)
                     if d < d_min:
                         b = v
                         d_min = d
@@ -60,37 +453,62 @@ def paris(graph):
             if chain != []:
                 c = chain.pop()
                 if b == c:
+                    if timed:
+                        merge_start = time.perf_counter()
                     dendrogram.append([a, b, d, s[a] + s[b]])
-                    graph_copy.add_node(u)
-                    neighbors_a = list(graph_copy.neighbors(a))
-                    neighbors_b = list(graph_copy.neighbors(b))
-                    for v in neighbors_a:
-                        graph_copy.add_edge(u, v, weight=graph_copy[a][v]['weight'])
+                    neighbors_u = adjacency.pop(a)
+                    neighbors_b = adjacency.pop(b)
+                    neighbors_u.pop(a, None)
+                    neighbors_u.pop(b, None)
                     for v in neighbors_b:
-                        if graph_copy.has_edge(u, v):
-                            graph_copy[u][v]['weight'] += graph_copy[b][v]['weight']
+                        if v == a or v == b:
+                            continue
+                        if v in neighbors_u:
+                            neighbors_u[v] += neighbors_b[v]
                         else:
-                            graph_copy.add_edge(u, v, weight=graph_copy[b][v]['weight'])
-                    graph_copy.remove_node(a)
-                    graph_copy.remove_node(b)
+                            neighbors_u[v] = neighbors_b[v]
+                    for v in neighbors_u:
+                        neighbors_v = adjacency[v]
+                        neighbors_v.pop(a, None)
+                        neighbors_v.pop(b, None)
+                        neighbors_v[u] = neighbors_u[v]
+                    adjacency[u] = neighbors_u
                     n_nodes -= 1
                     w[u] = w.pop(a) + w.pop(b)
                     s[u] = s.pop(a) + s.pop(b)
                     u += 1
+                    if timed:
+                        merge_time += time.perf_counter() - merge_start
+                    if callback is not None and len(dendrogram) % callback_interval == 0:
+                        callback(len(dendrogram), n_nodes + len(cc), elapsed + time.perf_counter() - start)
                 else:
                     chain.append(c)
                     chain.append(a)
                     chain.append(b)
+                    if len(chain) > max_chain_length:
+                        max_chain_length = len(chain)
             elif b >= 0:
                 chain.append(a)
                 chain.append(b)
+                if len(chain) > max_chain_length:
+                    max_chain_length = len(chain)
             else:
                 cc.append((a, s[a]))
-                graph_copy.remove_node(a)
+                adjacency.pop(a)
                 w.pop(a)
                 s.pop(a)
                 n_nodes -= 1
 
+    if timed:
+        stats.times['chain'] = time.perf_counter() - start - merge_time
+        stats.times['merge'] = merge_time
+        stats.chain_steps = chain_steps
+        stats.neighbor_scans = neighbor_scans
+        stats.max_chain_length = max_chain_length
+        stats.merges = len(dendrogram)
+        stats.components = len(cc)
+        start = time.perf_counter()
+
     a, s = cc.pop()
     for b, t in cc:
         s += t
@@ -98,7 +516,9 @@ def paris(graph):
         a = u
         u += 1
 
-    return reorder_dendrogram(np.array(dendrogram))
+    if timed:
+        stats.times['join'] = time.perf_counter() - start
+    return dendrogram
 
 
 def reorder_dendrogram(dendrogram):
@@ -126,6 +546,8 @@ def reorder_dendrogram(dendrogram):
     order[0] = range(n - 1)
     order[1] = np.array(dendrogram)[:, 2]
     index = np.lexsort(order)
-    n_index = {i: i for i in range(n)}
-    n_index.update({n + index[t]: n + t for t in range(n - 1)})
-    return np.array([[n_index[int(dendrogram[t][0])], n_index[int(dendrogram[t][1])], dendrogram[t][2], dendrogram[t][3]] for t in range(n - 1)])[index, :]
+    n_index = np.arange(2 * n - 1)
+    n_index[n + index] = n + np.arange(n - 1)
+    reordered = np.array(dendrogram, dtype=float)[index, :]
+    reordered[:, :2] = n_index[reordered[:, :2].astype(np.int64)]
+    return reordered
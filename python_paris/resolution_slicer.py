@@ -0,0 +1,152 @@
+import numpy as np
+from .dendrogram_utils import cluster_sizes, homogeneous_cut_weights, leaf_order
+
+
+def cuts_from_resolutions(dendrogram, resolutions):
+    """
+     Given a dendrogram and resolutions, compute the homogeneous cut level corresponding to each resolution.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     resolutions: list of double
+         The resolutions. At resolution r, the nodes are merged as long as the distance between merged nodes is not
+         larger than r, as in clustering_from_distance.
+
+     Returns
+     -------
+     cuts: numpy.array
+         The cut level of each resolution, i.e. the number of merges done at this resolution.
+
+     References
+     ----------
+     -
+     """
+    resolutions = np.asarray(resolutions, dtype=float)
+    if np.any(resolutions < 0):
+        raise ValueError
+    distances = np.maximum.accumulate(np.asarray(dendrogram)[:, 2].astype(float))
+    return np.searchsorted(distances, resolutions, side='right')
+
+
+def clusterings_from_resolutions(dendrogram, resolutions):
+    """
+     Given a dendrogram and resolutions, compute the partition corresponding to each resolution.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     resolutions: list of double
+         The resolutions at which the partitions are extracted.
+
+     Returns
+     -------
+     labels: numpy.array
+         For each resolution, the cluster of each node. The clusters are labeled by their cut level: the n first cut
+         levels are the sole nodes, the cut level n+t is the cluster created after t merges.
+
+     References
+     ----------
+     -
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    cuts = cuts_from_resolutions(dendrogram, resolutions)
+    order, offsets = leaf_order(dendrogram)
+    sizes = cluster_sizes(dendrogram)
+    parents = np.full(2 * n_nodes - 1, 2 * n_nodes - 1, dtype=np.int64)
+    children = np.asarray(dendrogram)[:, :2].astype(np.int64)
+    parents[children[:, 0]] = np.arange(n_nodes, 2 * n_nodes - 1)
+    parents[children[:, 1]] = np.arange(n_nodes, 2 * n_nodes - 1)
+
+    labels = np.zeros((len(cuts), n_nodes), dtype=np.int64)
+    for k, cut in enumerate(cuts):
+        clusters = np.arange(n_nodes, n_nodes + cut)
+        clusters = clusters[parents[clusters] >= n_nodes + cut]
+        labels[k] = np.arange(n_nodes)
+        if len(clusters) > 0:
+            starts = np.repeat(offsets[clusters] - np.cumsum(sizes[clusters]) + sizes[clusters], sizes[clusters])
+            positions = starts + np.arange(len(starts))
+            labels[k, order[positions]] = np.repeat(clusters, sizes[clusters])
+    return labels
+
+
+def modularity_from_resolutions(dendrogram, indptr, indices, data, resolutions, node_weights=None):
+    """
+     Given a dendrogram, the graph it comes from and resolutions, compute the modularity of the partition corresponding
+     to each resolution, without extracting the partitions.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     indptr: numpy.array
+         Index pointers of the CSR adjacency.
+     indices: numpy.array
+         Column indices of the CSR adjacency. The adjacency must be symmetric.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+     resolutions: list of double
+         The resolutions at which the partitions are evaluated.
+     node_weights: numpy.array
+         Weight of each node. By default, its degree with the self-loops counted twice, as in paris (see
+         node_degrees).
+
+     Returns
+     -------
+     modularities: numpy.array
+         For each resolution r, the modularity sum_C (r * p(C, C) - p(C)^2) of the partition, where p(C, C) is the
+         weight inside the cluster C and p(C) the weight of the cluster C, both normalized by the total weight.
+
+     References
+     ----------
+     -
+     """
+    resolutions = np.asarray(resolutions, dtype=float)
+    cuts = cuts_from_resolutions(dendrogram, resolutions)
+    internal, squares, wtot = homogeneous_cut_weights(dendrogram, indptr, indices, data, node_weights=node_weights)
+
+    return resolutions * internal[cuts] / wtot - squares[cuts] / wtot ** 2
+
+
+def resolution_sweep(dendrogram, indptr, indices, data, resolutions, node_weights=None):
+    """
+     Given a dendrogram, the graph it comes from and resolutions, compute the partition corresponding to each
+     resolution and its modularity, without running any new clustering.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     indptr: numpy.array
+         Index pointers of the CSR adjacency.
+     indices: numpy.array
+         Column indices of the CSR adjacency. The adjacency must be symmetric.
+     data: numpy.array
+         Edge weights of the CSR adjacency.
+     resolutions: list of double
+         The resolutions, e.g. the ranked distances of ranking_distances.
+     node_weights: numpy.array
+         Weight of each node. By default, its degree with the self-loops counted twice, as in paris (see
+         node_degrees).
+
+     Returns
+     -------
+     labels: numpy.array
+         For each resolution, the cluster of each node, as in clusterings_from_resolutions.
+     modularities: numpy.array
+         For each resolution, the modularity of the partition, as in modularity_from_resolutions.
+
+     References
+     ----------
+     -
+     """
+    labels = clusterings_from_resolutions(dendrogram, resolutions)
+    modularities = modularity_from_resolutions(dendrogram, indptr, indices, data, resolutions,
+                                               node_weights=node_weights)
+    return labels, modularities
@@ -0,0 +1,181 @@
+import math
+import random
+
+import numpy as np
+from .paris import paris_csr
+from .dendrogram_utils import merge_weights
+
+# Memory of a sampled edge in the reservoir, in bytes (two int64 nodes and a float64 weight).
+EDGE_BYTES = 24
+
+
+class EdgeReservoir:
+    """
+     Uniform sample of bounded size of a stream of weighted edges (e.g. interactions between users), from which the
+     paris hierarchy is estimated. The sample is maintained with reservoir sampling (algorithm L), the node weights are
+     either tracked exactly or estimated from the sample.
+
+     Parameters
+     ----------
+     sample_size: int
+         Number of edges kept in the reservoir.
+     max_memory: int
+         If given, memory budget of the reservoir in bytes, which sets the sample size instead of sample_size.
+     exact_node_weights: bool
+         If True, the node weights are summed over the whole stream (one float per node). Otherwise they are estimated
+         from the sample.
+     seed: int
+         Seed of the random generator.
+     """
+    def __init__(self, sample_size=10 ** 6, max_memory=None, exact_node_weights=True, seed=None):
+        if max_memory is not None:
+            sample_size = max_memory // EDGE_BYTES
+        if sample_size < 1:
+            raise ValueError
+        self.sample_size = int(sample_size)
+        self.exact_node_weights = exact_node_weights
+        self.random = random.Random(seed)
+        self.rows = np.zeros(self.sample_size, dtype=np.int64)
+        self.cols = np.zeros(self.sample_size, dtype=np.int64)
+        self.weights = np.zeros(self.sample_size)
+        self.n_sampled = 0
+        self.n_events = 0
+        self.index = {}
+        self.nodes = []
+        self.node_weights = []
+        self._threshold = 1.
+        self._next = self.sample_size - 1
+
+    def _node(self, node):
+        i = self.index.get(node)
+        if i is None:
+            i = len(self.nodes)
+            self.index[node] = i
+            self.nodes.append(node)
+            self.node_weights.append(0.)
+        return i
+
+    def _skip(self):
+        self._threshold *= math.exp(math.log(1. - self.random.random()) / self.sample_size)
+        self._next += int(math.floor(math.log(1. - self.random.random()) / math.log1p(-self._threshold))) + 1
+
+    def add(self, u, v, weight=1.):
+        """
+         Add an edge of the stream.
+         """
+        i = self._node(u)
+        j = self._node(v)
+        if self.exact_node_weights:
+            self.node_weights[i] += weight
+            self.node_weights[j] += weight
+        if self.n_sampled < self.sample_size:
+            slot = self.n_sampled
+            self.n_sampled += 1
+            if self.n_sampled == self.sample_size:
+                self._skip()
+        elif self.n_events == self._next:
+            slot = self.random.randrange(self.sample_size)
+            self._skip()
+        else:
+            slot = None
+        if slot is not None:
+            self.rows[slot] = i
+            self.cols[slot] = j
+            self.weights[slot] = weight
+        self.n_events += 1
+
+    def update(self, edges):
+        """
+         Add the edges (u, v) or (u, v, weight) of an iterable.
+         """
+        for edge in edges:
+            self.add(*edge)
+
+    def adjacency(self):
+        """
+         Estimate the adjacency of the graph from the sample: each sampled edge stands for n_events / n_sampled edges.
+
+         Returns
+         -------
+         indptr, indices, data: numpy.array
+             The estimated symmetric CSR adjacency, over the nodes seen in the stream.
+         counts: numpy.array
+             Number of sampled edges behind each entry of the adjacency.
+         """
+        n_nodes = len(self.nodes)
+        scale = float(self.n_events) / self.n_sampled if self.n_sampled > 0 else 0.
+        rows = np.concatenate((self.rows[:self.n_sampled], self.cols[:self.n_sampled]))
+        cols = np.concatenate((self.cols[:self.n_sampled], self.rows[:self.n_sampled]))
+        weights = np.concatenate((self.weights[:self.n_sampled], self.weights[:self.n_sampled])) * scale
+        keys, inverse = np.unique(rows * n_nodes + cols, return_inverse=True)
+        data = np.bincount(inverse, weights=weights, minlength=len(keys)).astype(float)
+        counts = np.bincount(inverse, minlength=len(keys)).astype(float)
+        # A self-loop appears twice in the concatenation but is a single sampled edge.
+        loops = keys // n_nodes == keys % n_nodes if n_nodes > 0 else np.zeros(0, dtype=bool)
+        data[loops] /= 2
+        counts[loops] /= 2
+        indices = keys % n_nodes if n_nodes > 0 else keys
+        indptr = np.concatenate(([0], np.cumsum(np.bincount(keys // max(n_nodes, 1), minlength=n_nodes))))
+        return indptr, indices, data, counts
+
+    def paris(self):
+        """
+         Estimate the paris hierarchy of the stream from the sample.
+
+         Returns
+         -------
+         dendrogram: numpy.array
+             Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+             nodes in the new cluster. The nodes are labeled by their order of appearance in the stream (see nodes).
+         distance_errors: numpy.array
+             Estimated standard error of each merge distance. The weight between two merged clusters is estimated
+             from c sampled edges, with a relative standard error of about 1 / sqrt(c) (Poisson approximation), which
+             carries over to the distance. The error is infinite when no sampled edge joins the clusters.
+         """
+        indptr, indices, data, counts = self.adjacency()
+        node_weights = np.array(self.node_weights) if self.exact_node_weights else None
+        dendrogram = paris_csr(indptr, indices, data, node_weights=node_weights)
+        sampled, _ = merge_weights(dendrogram, indptr, indices, counts)
+        sampled = sampled / 2
+        distance_errors = np.full(len(sampled), np.inf)
+        joined = sampled > 0
+        distance_errors[joined] = dendrogram[joined, 2] / np.sqrt(sampled[joined])
+        return dendrogram, distance_errors
+
+
+def paris_from_stream(edges, sample_size=10 ** 6, max_memory=None, exact_node_weights=True, seed=None):
+    """
+     Given a stream of edges, estimate the paris hierarchy from a bounded sample of the edges.
+
+     Parameters
+     ----------
+     edges: iterable
+         Edges (u, v) or (u, v, weight) of the stream.
+     sample_size: int
+         Number of edges kept in the sample.
+     max_memory: int
+         If given, memory budget of the sample in bytes, which sets the sample size instead of sample_size.
+     exact_node_weights: bool
+         If True, the node weights are summed over the whole stream. Otherwise they are estimated from the sample.
+     seed: int
+         Seed of the random generator.
+
+     Returns
+     -------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     distance_errors: numpy.array
+         Estimated standard error of each merge distance.
+     nodes: list
+         The nodes of the stream, in the order of the labels of the dendrogram.
+
+     References
+     ----------
+     -
+     """
+    reservoir = EdgeReservoir(sample_size=sample_size, max_memory=max_memory, exact_node_weights=exact_node_weights,
+                              seed=seed)
+    reservoir.update(edges)
+    dendrogram, distance_errors = reservoir.paris()
+    return dendrogram, distance_errors, reservoir.nodes
@@ -0,0 +1,293 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from .cluster_cut_slicer import clustering_from_cluster_cut, best_cluster_cut, ranking_cluster_cuts
+from .homogeneous_cut_slicer import clustering_from_homogeneous_cut, best_homogeneous_cut, ranking_homogeneous_cuts
+from .heterogeneous_cut_slicer import clustering_from_heterogeneous_cut, best_heterogeneous_cut, \
+    ranking_heterogeneous_cuts
+from .distance_slicer import clustering_from_distance, best_distance, ranking_distances
+from .compression import load_dendrogram
+
+
+def membership(dendrogram, node, distance=None, cut=None):
+    """
+     Given a dendrogram, a node and a distance or homogeneous cut level, compute the cluster of the node.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     node: int
+         The node.
+     distance: double
+         The distance level, as in clustering_from_distance.
+     cut: int
+         The homogeneous cut level, as in clustering_from_homogeneous_cut. Used if distance is None.
+
+     Returns
+     -------
+     cluster: int
+         The cluster cut level of the cluster of the node: the node itself or n+t for the cluster created after t
+         merges.
+
+     References
+     ----------
+     -
+     """
+    return MembershipIndex(dendrogram).cluster(node, distance=distance, cut=cut)
+
+
+class MembershipIndex:
+    """
+     Ancestors of each cluster at power-of-two heights (binary lifting) and cumulative maximum of the merge distances
+     of a dendrogram, computed once so that each membership query takes O(log n) steps, whatever the depth of the
+     dendrogram. The ancestors take O(n log d) memory, with d the depth of the dendrogram.
+     """
+    def __init__(self, dendrogram):
+        self.n_nodes = np.shape(dendrogram)[0] + 1
+        n_nodes = self.n_nodes
+        self.distances = np.maximum.accumulate(np.asarray(dendrogram[:, 2], dtype=float))
+        # The parent of the root is the sentinel 2n-1, its own parent, larger than any cluster.
+        parents = np.full(2 * n_nodes, 2 * n_nodes - 1, dtype=np.int32 if n_nodes < 2 ** 30 else np.int64)
+        parents[np.asarray(dendrogram[:, 0]).astype(np.int64)] = np.arange(n_nodes, 2 * n_nodes - 1)
+        parents[np.asarray(dendrogram[:, 1]).astype(np.int64)] = np.arange(n_nodes, 2 * n_nodes - 1)
+        self.ancestors = [parents]
+        while np.any(self.ancestors[-1][:-1] != 2 * n_nodes - 1):
+            self.ancestors.append(self.ancestors[-1][self.ancestors[-1]])
+
+    def cluster(self, node, distance=None, cut=None):
+        """
+         Cluster of a node at a distance or homogeneous cut level, as in membership.
+         """
+        n_nodes = self.n_nodes
+        if node < 0 or node >= n_nodes:
+            raise ValueError
+        if distance is not None:
+            if distance < 0:
+                raise ValueError
+            cut = int(np.searchsorted(self.distances, distance, side='right'))
+        elif cut is None or cut < 0 or cut > n_nodes - 1:
+            raise ValueError
+        # The labels increase along the path to the root: jump to the highest ancestor created before the cut.
+        cluster = node
+        for ancestors in reversed(self.ancestors):
+            if ancestors[cluster] < n_nodes + cut:
+                cluster = int(ancestors[cluster])
+        return cluster
+
+
+QUERIES = {
+    'cluster': lambda dendrogram, q: clustering_from_cluster_cut(dendrogram, q['cut']),
+    'homogeneous': lambda dendrogram, q: clustering_from_homogeneous_cut(dendrogram, q['cut']),
+    'heterogeneous': lambda dendrogram, q: clustering_from_heterogeneous_cut(dendrogram, set(q['cut'])),
+    'distance': lambda dendrogram, q: clustering_from_distance(dendrogram, q['distance']),
+    'membership': lambda dendrogram, q: membership(dendrogram, q['node'], distance=q.get('distance'),
+                                                   cut=q.get('cut')),
+    'best_cluster': lambda dendrogram, q: best_cluster_cut(dendrogram),
+    'best_homogeneous': lambda dendrogram, q: best_homogeneous_cut(dendrogram),
+    'best_heterogeneous': lambda dendrogram, q: best_heterogeneous_cut(dendrogram),
+    'best_distance': lambda dendrogram, q: best_distance(dendrogram),
+    'ranking_cluster': lambda dendrogram, q: [r[:q.get('k')] for r in ranking_cluster_cuts(dendrogram)],
+    'ranking_homogeneous': lambda dendrogram, q: [r[:q.get('k')] for r in ranking_homogeneous_cuts(dendrogram)],
+    'ranking_heterogeneous': lambda dendrogram, q: ranking_heterogeneous_cuts(dendrogram, q.get('k', 1)),
+    'ranking_distance': lambda dendrogram, q: [r[:q.get('k')] for r in ranking_distances(dendrogram)],
+}
+
+
+def to_json(value):
+    """
+     Convert the result of a slicer to JSON-serializable values: numpy scalars and arrays, tuples and sets become
+     Python numbers and lists, and the non-finite floats (e.g. the infinite distance between disconnected components)
+     become None, so that the output is valid JSON.
+     """
+    if isinstance(value, dict):
+        return {k: to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, set, np.ndarray)):
+        return [to_json(v) for v in (sorted(value) if isinstance(value, set) else value)]
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, (float, np.floating)):
+        return float(value) if np.isfinite(value) else None
+    return value
+
+
+def _run_query(dendrogram, request):
+    # Module-level tasks, so that they can be pickled for a ProcessPoolExecutor.
+    return to_json(QUERIES[request['query']](dendrogram, request))
+
+
+def _run_membership(index, request):
+    return index.cluster(request['node'], distance=request.get('distance'), cut=request.get('cut'))
+
+
+def _load(dendrogram):
+    if not isinstance(dendrogram, str):
+        return np.asarray(dendrogram)
+    if dendrogram.endswith('.pdz'):
+        return load_dendrogram(dendrogram)
+    return np.load(dendrogram, mmap_mode='r')
+
+
+class DendrogramServer:
+    """
+     Asyncio server answering cut, membership and ranking queries on fixed dendrograms.
+
+     The dendrograms are loaded once, memory-mapped if they are given as paths of .npy files and decoded if they are
+     given as paths of .pdz files (see save_dendrogram), and their membership indexes are built at the same time. The
+     slicers run in a bounded pool of workers so that the event loop is never blocked, and identical concurrent
+     queries share a single computation. A query is a dictionary with the name of the 'dendrogram', the 'query' type
+     (a key of QUERIES) and its parameters ('cut', 'distance', 'node', 'k').
+
+     Parameters
+     ----------
+     dendrograms: dict
+         The dendrograms by name: arrays or paths of .npy or .pdz files.
+     max_workers: int
+         Number of threads of the default pool.
+     executor: concurrent.futures.Executor
+         If given, the pool running the slicers instead of a ThreadPoolExecutor with max_workers threads. The tasks
+         are module-level functions, so a ProcessPoolExecutor also works, but the dendrogram (or membership index) of
+         a query is then pickled and sent to the worker with each query. The executor is shut down by close.
+     """
+    def __init__(self, dendrograms, max_workers=4, executor=None):
+        self.dendrograms = {name: _load(d) for name, d in dendrograms.items()}
+        self.memberships = {name: MembershipIndex(d) for name, d in self.dendrograms.items()}
+        self.executor = executor if executor is not None else ThreadPoolExecutor(max_workers=max_workers)
+        self.pending = {}
+        self.computations = 0
+
+    async def query(self, request):
+        """
+         Answer a query. Identical queries running at the same time are computed once.
+
+         Parameters
+         ----------
+         request: dict
+             The query.
+
+         Returns
+         -------
+         result: JSON-serializable value
+             The result of the slicer.
+         """
+        if request.get('dendrogram') not in self.dendrograms or request.get('query') not in QUERIES:
+            raise ValueError('unknown dendrogram or query: {}'.format(request))
+        key = json.dumps(request, sort_keys=True)
+        if key in self.pending:
+            return await asyncio.shield(self.pending[key])
+        loop = asyncio.get_running_loop()
+        if request['query'] == 'membership':
+            future = loop.run_in_executor(self.executor, _run_membership, self.memberships[request['dendrogram']],
+                                          request)
+        else:
+            future = loop.run_in_executor(self.executor, _run_query, self.dendrograms[request['dendrogram']], request)
+        self.pending[key] = future
+        future.add_done_callback(lambda f: self.pending.pop(key, None))
+        self.computations += 1
+        return await asyncio.shield(future)
+
+    async def handle(self, reader, writer):
+        """
+         Serve a connection: each line received is a JSON query with an optional 'id', each line sent back is a JSON
+         object with the same 'id' and either a 'result' or an 'error'. Queries of a connection run concurrently.
+         """
+        lock = asyncio.Lock()
+
+        async def answer(line):
+            request = None
+            try:
+                request = json.loads(line)
+                response = {'id': request.get('id'), 'result': await self.query(
+                    {k: v for k, v in request.items() if k != 'id'})}
+            except Exception as e:
+                response = {'id': request.get('id') if isinstance(request, dict) else None,
+                            'error': '{}: {}'.format(type(e).__name__, e)}
+            async with lock:
+                writer.write((json.dumps(to_json(response), allow_nan=False) + '\n').encode())
+                await writer.drain()
+
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+
+    async def serve(self, host='127.0.0.1', port=8765):
+        """
+         Start listening for connections.
+
+         Returns
+         -------
+         server: asyncio.Server
+             The running server, to be closed by the caller.
+         """
+        return await asyncio.start_server(self.handle, host, port)
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+
+class DendrogramClient:
+    """
+     Client of a DendrogramServer over TCP.
+     """
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.responses = {}
+        self.next_id = 0
+        self.lock = asyncio.Lock()
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=8765):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def query(self, **request):
+        self.next_id += 1
+        request_id = self.next_id
+        future = asyncio.get_running_loop().create_future()
+        self.responses[request_id] = future
+        self.writer.write((json.dumps(dict(request, id=request_id)) + '\n').encode())
+        await self.writer.drain()
+        async with self.lock:
+            while not future.done():
+                line = await self.reader.readline()
+                if not line:
+                    # The connection is closed: the queries waiting for a response will never get one.
+                    for pending in self.responses.values():
+                        if not pending.done():
+                            pending.set_exception(ConnectionError('connection closed by the server'))
+                    self.responses.clear()
+                    break
+                response = json.loads(line)
+                self.responses.pop(response['id']).set_result(response)
+        response = future.result()
+        if 'error' in response:
+            raise RuntimeError(response['error'])
+        return response['result']
+
+    async def close(self):
+        self.writer.close()
+
+
+class LocalClient:
+    """
+     Stand-in client that sends queries to a DendrogramServer in the same event loop, without sockets.
+     """
+    def __init__(self, server):
+        self.server = server
+
+    async def query(self, **request):
+        return await self.server.query(request)
@@ -0,0 +1,41 @@
+import unittest
+from python_paris.batch import *
+from python_paris.paris import paris_csr
+
+
+class TestBatch(unittest.TestCase):
+
+    def setUp(self):
+            self.path = (np.array([0, 1, 3, 5, 6]), np.array([1, 0, 2, 1, 3, 2]), np.array([2., 2., 1., 1., 2., 2.]))
+            self.triangle = (np.array([0, 2, 4, 6]), np.array([1, 2, 0, 2, 0, 1]), np.array([1., 3., 1., 1., 3., 1.]))
+            self.node = (np.array([0, 0]), np.zeros(0, dtype=int), np.zeros(0))
+
+    def test_block_diagonal_csr(self):
+        indptr, indices, data, offsets = block_diagonal_csr([self.path, self.node, self.triangle])
+        self.assertEqual(offsets.tolist(), [0, 4, 5, 8])
+        self.assertEqual(indptr.tolist(), [0, 1, 3, 5, 6, 6, 8, 10, 12])
+        self.assertEqual(indices.tolist()[6:], [6, 7, 5, 7, 5, 6])
+
+    def test_paris_batch(self):
+        graphs = [self.path, self.node, self.triangle, self.path]
+        indptr, indices, data, offsets = block_diagonal_csr(graphs)
+        dendrograms = paris_batch(indptr, indices, data, offsets)
+        self.assertEqual(len(dendrograms), 4)
+        self.assertTrue(np.array_equal(dendrograms[0], paris_csr(*self.path)))
+        self.assertEqual(np.shape(dendrograms[1]), (0, 4))
+        self.assertTrue(np.array_equal(dendrograms[2], paris_csr(*self.triangle)))
+        self.assertTrue(np.array_equal(dendrograms[3], dendrograms[0]))
+
+        dendrogram, row_offsets = paris_batch(indptr, indices, data, offsets, n_jobs=2, chunk_size=1,
+                                              concatenate=True)
+        self.assertEqual(row_offsets.tolist(), [0, 3, 3, 5, 8])
+        self.assertTrue(np.array_equal(dendrogram, np.concatenate(dendrograms)))
+
+        # Self-loop and repeated entry.
+        loops = (np.array([0, 4, 5, 7]), np.array([0, 1, 1, 2, 0, 0, 2]), np.array([2., 1., 1., 1., 2., 1., 1.]))
+        self.assertTrue(np.array_equal(paris_batch(*block_diagonal_csr([loops]))[0], paris_csr(*loops)))
+
+        with self.assertRaises(ValueError):
+            paris_batch(indptr, indices, data, [0, 4, 4, 5, 8, 11])
+        with self.assertRaises(ValueError):
+            paris_batch(indptr, np.roll(indices, 1), data, offsets)
@@ -1,5 +1,7 @@
 import unittest
+import networkx as nx
 from python_paris.cluster_cut_slicer import *
+from python_paris.paris import paris
 
 
 class TestClusterSlicer(unittest.TestCase):
@@ -37,3 +39,31 @@ class TestClusterSlicer(unittest.TestCase):
     def test_ranking_cluster_cuts(self):
         ranked_cuts, ranked_scores = ranking_cluster_cuts(self.dendrogram)
         self.assertEqual(ranked_cuts, [4, 5, 0, 1, 2, 3])
+        self.assertEqual(ranking_cluster_cuts(self.dendrogram, n_jobs=2), (ranked_cuts, ranked_scores))
+
+        # The default scorer is sent to the processes.
+        dendrogram = paris(nx.les_miserables_graph())
+        self.assertEqual(ranking_cluster_cuts(dendrogram, n_jobs=2, backend='process'),
+                         ranking_cluster_cuts(dendrogram))
+
+    def test_conductance_cluster_cuts(self):
+        indptr = np.array([0, 1, 3, 5, 6])
+        indices = np.array([1, 0, 2, 1, 3, 2])
+        data = np.array([2., 2., 1., 1., 2., 2.])
+        conductances = conductance_cluster_cuts(self.dendrogram, indptr, indices, data)
+        self.assertEqual(len(conductances), 7)
+        self.assertAlmostEqual(conductances[0], 1.)
+        self.assertAlmostEqual(conductances[5], 1. / 5)
+        self.assertAlmostEqual(conductances[4], 1. / 5)
+        self.assertAlmostEqual(conductances[6], 0.)
+
+        # Self-loops count twice in the node weights and never leave a cluster, as in networkx.
+        graph = nx.Graph(nx.les_miserables_graph())
+        graph.add_edge('Valjean', 'Valjean', weight=3)
+        nodes = list(graph.nodes())
+        adjacency = nx.to_scipy_sparse_array(graph, nodelist=nodes, format='csr', dtype=float)
+        dendrogram = paris(graph)
+        conductances = conductance_cluster_cuts(dendrogram, adjacency.indptr, adjacency.indices, adjacency.data)
+        for cut in [nodes.index('Valjean'), 100, 140, 150]:
+            cluster = [nodes[i] for i in clustering_from_cluster_cut(dendrogram, cut)]
+            self.assertAlmostEqual(conductances[cut], nx.conductance(graph, cluster, weight='weight'))
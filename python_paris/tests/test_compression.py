@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+import networkx as nx
+from python_paris.compression import *
+from python_paris.paris import paris
+
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self):
+            self.dendrogram = np.array([[0, 1, 1., 2],
+                                        [2, 3, 2., 2],
+                                        [4, 5, 4., 4]])
+
+    def test_encode_decode(self):
+        self.assertTrue(np.array_equal(decode_dendrogram(encode_dendrogram(self.dendrogram)), self.dendrogram))
+        self.assertTrue(np.array_equal(decode_dendrogram(encode_dendrogram(self.dendrogram, block_size=1)),
+                                       self.dendrogram))
+        self.assertEqual(np.shape(decode_dendrogram(encode_dendrogram(np.zeros((0, 4))))), (0, 4))
+
+        graph = nx.disjoint_union(nx.karate_club_graph().to_undirected(as_view=False), nx.path_graph(5))
+        graph = nx.Graph(graph.edges())
+        dendrogram = paris(graph)
+        self.assertTrue(np.isinf(dendrogram[-1, 2]))
+        data = encode_dendrogram(dendrogram, block_size=7)
+        self.assertTrue(np.array_equal(decode_dendrogram(data), dendrogram))
+        self.assertLess(len(data), dendrogram.nbytes)
+
+        with self.assertRaises(ValueError):
+            encode_dendrogram(self.dendrogram, block_size=0)
+        with self.assertRaises(ValueError):
+            encode_dendrogram(self.dendrogram, distance_bits=0)
+        with self.assertRaises(ValueError):
+            encode_dendrogram(np.array([[0, 4, 1., 2], [2, 3, 2., 2], [4, 5, 4., 4]]))
+        with self.assertRaises(ValueError):
+            decode_dendrogram(b'NOTPARIS' + encode_dendrogram(self.dendrogram)[8:])
+
+    def test_quantize_distances(self):
+        distances = np.sort(np.random.RandomState(0).exponential(size=1000))
+        quantized = quantize_distances(np.concatenate((distances, [np.inf])), 10)
+        self.assertTrue(np.isinf(quantized[-1]))
+        self.assertLessEqual(np.max(np.abs(quantized[:-1] - distances) / distances), 2 ** -11)
+        self.assertTrue(np.all(np.diff(quantized) >= 0))
+
+        dendrogram = paris(nx.Graph(nx.karate_club_graph().edges()))
+        decoded = decode_dendrogram(encode_dendrogram(dendrogram, distance_bits=10))
+        self.assertTrue(np.array_equal(decoded[:, [0, 1, 3]], dendrogram[:, [0, 1, 3]]))
+        self.assertTrue(np.array_equal(decoded[:, 2], quantize_distances(dendrogram[:, 2], 10)))
+
+    def test_compressed_dendrogram(self):
+        dendrogram = paris(nx.Graph(nx.karate_club_graph().edges()))
+        compressed = CompressedDendrogram(encode_dendrogram(dendrogram, block_size=5))
+        self.assertEqual(compressed.n_merges, 33)
+        self.assertTrue(np.array_equal(compressed.children(7, 19), dendrogram[7:19, :2]))
+        self.assertTrue(np.array_equal(compressed.distances(10, 10), np.zeros(0)))
+        self.assertTrue(np.array_equal(compressed.rows(12, 33), dendrogram[12:]))
+        self.assertTrue(np.array_equal(compressed.dendrogram(), dendrogram))
+        with self.assertRaises(ValueError):
+            compressed.rows(0, 34)
+
+        # The rows of a range are decoded from the blocks of the range only.
+        data = bytearray(encode_dendrogram(dendrogram, block_size=5))
+        first, last = compressed.data_offset + compressed.offsets[[0, 3 * 5]]
+        data[first:last] = bytes(last - first)
+        self.assertTrue(np.array_equal(CompressedDendrogram(bytes(data)).rows(26, 33), dendrogram[26:]))
+
+    def test_save_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'dendrogram.pdz')
+            save_dendrogram(path, self.dendrogram, block_size=2)
+            self.assertTrue(np.array_equal(load_dendrogram(path), self.dendrogram))
+            with CompressedDendrogram(path) as compressed:
+                self.assertTrue(np.array_equal(compressed.rows(1), self.dendrogram[1:]))
+            self.assertTrue(compressed._mmap is None)
+            with self.assertRaises(ValueError):
+                compressed.rows(1)
+            os.remove(path)
@@ -0,0 +1,72 @@
+import io
+import json
+import unittest
+from python_paris.conversion import *
+
+
+class TestConversion(unittest.TestCase):
+
+    def setUp(self):
+            self.dendrogram = np.array([[0, 1, 1., 2],
+                                        [2, 3, 2., 2],
+                                        [4, 5, 4., 4]])
+            self.disconnected_dendrogram = np.array([[0, 1, 1., 2],
+                                                     [2, 3, 2., 2],
+                                                     [4, 5, float("inf"), 4]])
+
+    def test_linkage(self):
+        linkage = to_linkage(self.dendrogram)
+        self.assertTrue(np.shares_memory(linkage, self.dendrogram))
+        linkage = to_linkage(self.disconnected_dendrogram)
+        self.assertEqual(linkage[:, 2].tolist(), [1., 2., 4.])
+        self.assertTrue(np.isinf(self.disconnected_dendrogram[2, 2]))
+        self.assertEqual(to_linkage(self.disconnected_dendrogram, inf_distance=10.)[2, 2], 10.)
+        self.assertTrue(np.array_equal(from_linkage(linkage), linkage))
+
+        try:
+            from scipy.cluster.hierarchy import is_valid_linkage
+        except ImportError:
+            return
+        self.assertTrue(is_valid_linkage(linkage))
+
+    def test_parent_pointers(self):
+        parents = to_parent_pointers(self.dendrogram)
+        self.assertEqual(parents.tolist(), [4, 4, 5, 5, 6, 6, -1])
+        self.assertTrue(np.array_equal(from_parent_pointers(parents, [1., 2., 4.]), self.dendrogram))
+        self.assertTrue(np.array_equal(from_parent_pointers(parents, [2., 1., 4.]),
+                                       np.array([[2, 3, 1., 2], [0, 1, 2., 2], [5, 4, 4., 4]])))
+
+        with self.assertRaises(ValueError):
+            from_parent_pointers([4, 4, 5, 5, 6, 6, 6], [1., 2., 4.])
+        # The root is not the last cluster.
+        with self.assertRaises(ValueError):
+            from_parent_pointers([4, 4, 6, 6, -1, 4, 5], [1., 2., 4.])
+        # A parent is smaller than its child.
+        with self.assertRaises(ValueError):
+            from_parent_pointers([4, 5, 5, 6, 6, 4, -1], [1., 2., 4.])
+        # An even number of clusters.
+        with self.assertRaises(ValueError):
+            from_parent_pointers([4, 4, 5, 5, 5, -1], [1., 2.])
+
+    def test_write_newick(self):
+        f = io.StringIO()
+        write_newick(self.dendrogram, f)
+        self.assertEqual(f.getvalue(), '((0:1.0,1:1.0):3.0,(2:2.0,3:2.0):2.0);\n')
+        f = io.StringIO()
+        write_newick(self.disconnected_dendrogram, f, labels=['a', 'b', 'c d', 'e'])
+        self.assertEqual(f.getvalue(), "((a:1.0,b:1.0):3.0,('c d':2.0,e:2.0):2.0);\n")
+
+        n_nodes = 10000
+        chain = np.array([[0 if t == 0 else n_nodes + t - 1, t + 1, t + 1., t + 2] for t in range(n_nodes - 1)])
+        f = io.StringIO()
+        write_newick(chain, f, buffer_size=100)
+        self.assertEqual(f.getvalue().count('('), n_nodes - 1)
+
+    def test_write_json(self):
+        f = io.StringIO()
+        write_json(self.disconnected_dendrogram, f)
+        tree = json.loads(f.getvalue())
+        self.assertEqual(tree['id'], 6)
+        self.assertEqual(tree['distance'], 4.)
+        self.assertEqual(tree['size'], 4)
+        self.assertEqual(tree['children'][1]['children'][0], {'id': 2, 'name': 2})
@@ -0,0 +1,51 @@
+import unittest
+import networkx as nx
+from python_paris.dendrogram_utils import *
+from python_paris.paris import paris
+
+
+def ratio_scoring(w, x, y):
+    return w * x / y
+
+
+class TestDendrogramUtils(unittest.TestCase):
+
+    def setUp(self):
+            self.dendrogram = np.array([[0, 1, 1., 2],
+                                        [2, 3, 2., 2],
+                                        [4, 5, 4., 4]])
+
+    def test_leaf_order(self):
+        self.assertEqual(cluster_sizes(self.dendrogram).tolist(), [1, 1, 1, 1, 2, 2, 4])
+        order, offsets = leaf_order(self.dendrogram)
+        self.assertEqual(order.tolist(), [0, 1, 2, 3])
+        self.assertEqual(offsets.tolist(), [0, 1, 2, 3, 0, 2, 0])
+        weights = cluster_weights(self.dendrogram, [1., 2., 3., 4.])
+        self.assertEqual(weights.tolist(), [1., 2., 3., 4., 3., 7., 10.])
+
+    def test_merge_weights(self):
+        indptr = np.array([0, 2, 4, 6, 7])
+        indices = np.array([0, 1, 0, 2, 1, 3, 2])
+        data = np.array([5., 2., 2., 1., 1., 2., 2.])
+        self.assertEqual(merge_levels(self.dendrogram, indptr, indices).tolist(), [-1, 0, 0, 2, 2, 1, 1])
+        weights, self_weight = merge_weights(self.dendrogram, indptr, indices, data)
+        self.assertEqual(weights.tolist(), [4., 4., 2.])
+        self.assertEqual(self_weight, 5.)
+
+    def test_cluster_internal_weights(self):
+        indptr = np.array([0, 2, 4, 6, 7])
+        indices = np.array([0, 1, 0, 2, 1, 3, 2])
+        data = np.array([5., 2., 2., 1., 1., 2., 2.])
+        internal = cluster_internal_weights(self.dendrogram, indptr, indices, data)
+        self.assertEqual(internal.tolist(), [5., 0., 0., 0., 9., 4., 15.])
+
+    def test_merge_scores(self):
+        scores = merge_scores(self.dendrogram, ratio_scoring)
+        self.assertEqual(scores, [0., 0., 0., 0., 8., 4.])
+        dendrogram = paris(nx.les_miserables_graph())
+        scores = merge_scores(dendrogram, ratio_scoring)
+        self.assertEqual(merge_scores(dendrogram, ratio_scoring, n_jobs=3, chunk_size=7), scores)
+        self.assertEqual(merge_scores(dendrogram, ratio_scoring, n_jobs=2, backend='process'), scores)
+
+        with self.assertRaises(ValueError):
+            merge_scores(dendrogram, ratio_scoring, n_jobs=2, backend='gpu')
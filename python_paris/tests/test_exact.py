@@ -0,0 +1,25 @@
+import math
+import unittest
+from python_paris.exact import *
+
+
+class TestExact(unittest.TestCase):
+
+    def setUp(self):
+            self.dendrogram = np.array([[0, 1, 1., 2],
+                                        [2, 3, 2., 2],
+                                        [4, 5, 4., 4]])
+
+    def test_exact_values(self):
+        self.assertEqual(exact_values([1., 2., 3.]), ([1, 2, 3], 1))
+        values, scale = exact_values([0.1, 0.2, 0.3])
+        self.assertEqual([v / scale for v in values], [0.1, 0.2, 0.3])
+        self.assertNotEqual((0.1 + 0.2) + 0.3, 0.1 + (0.2 + 0.3))
+        self.assertEqual(sum(values) / scale, math.fsum([0.1, 0.2, 0.3]))
+
+        with self.assertRaises(ValueError):
+            exact_values([1., float("inf")])
+
+    def test_canonical_dendrogram(self):
+        dendrogram = np.array([[3, 2, 2., 2], [1, 0, 1., 2], [5, 4, 4., 4]])
+        self.assertTrue(np.array_equal(canonical_dendrogram(dendrogram, [2, 0, 0]), self.dendrogram))
@@ -1,5 +1,7 @@
 import unittest
+import networkx as nx
 from python_paris.homogeneous_cut_slicer import *
+from python_paris.paris import paris
 
 
 class TestHomogeneoousCutSlicer(unittest.TestCase):
@@ -39,3 +41,32 @@ class TestHomogeneoousCutSlicer(unittest.TestCase):
         self.assertEqual(c, [[2], [3], [0, 1]])
         c = clustering_from_homogeneous_cut(self.dendrogram, ranked_cuts[2])
         self.assertEqual(c, [[0], [1], [2], [3]])
+        self.assertEqual(ranking_homogeneous_cuts(self.dendrogram, n_jobs=2), (ranked_cuts, ranked_cut_scores))
+
+        # The default scorer is sent to the processes.
+        dendrogram = paris(nx.les_miserables_graph())
+        self.assertEqual(ranking_homogeneous_cuts(dendrogram, n_jobs=2, backend='process'),
+                         ranking_homogeneous_cuts(dendrogram))
+
+    def test_modularity_homogeneous_cuts(self):
+        indptr = np.array([0, 1, 3, 5, 6])
+        indices = np.array([1, 0, 2, 1, 3, 2])
+        data = np.array([2., 2., 1., 1., 2., 2.])
+        modularities = modularity_homogeneous_cuts(self.dendrogram, indptr, indices, data)
+        self.assertEqual(len(modularities), 4)
+        self.assertAlmostEqual(modularities[0], - 2 * (2. / 10) ** 2 - 2 * (3. / 10) ** 2)
+        self.assertAlmostEqual(modularities[2], 8. / 10 - 2 * (5. / 10) ** 2)
+        self.assertAlmostEqual(modularities[3], 0.)
+        self.assertEqual(np.argmax(modularities), 2)
+
+        # Self-loops count twice in the node weights, as in networkx.
+        graph = nx.Graph(nx.les_miserables_graph())
+        graph.add_edge('Valjean', 'Valjean', weight=3)
+        graph.add_edge('Javert', 'Javert', weight=1)
+        nodes = list(graph.nodes())
+        adjacency = nx.to_scipy_sparse_array(graph, nodelist=nodes, format='csr', dtype=float)
+        dendrogram = paris(graph)
+        modularities = modularity_homogeneous_cuts(dendrogram, adjacency.indptr, adjacency.indices, adjacency.data)
+        for cut in [0, 40, 70, 76]:
+            clustering = [[nodes[i] for i in c] for c in clustering_from_homogeneous_cut(dendrogram, cut)]
+            self.assertAlmostEqual(modularities[cut], nx.algorithms.community.modularity(graph, clustering))
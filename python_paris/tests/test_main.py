@@ -0,0 +1,93 @@
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+import networkx as nx
+from python_paris.__main__ import *
+from python_paris.paris import paris
+from python_paris.compression import load_dendrogram
+
+
+class TestMain(unittest.TestCase):
+
+    def setUp(self):
+            self.edges = '# graph\na b 2\nb c\nc d 2\n\nb a\nd d 1\n'
+
+    def test_read_edges(self):
+        indptr, indices, data, nodes = read_edges(io.StringIO(self.edges))
+        self.assertEqual(nodes, ['a', 'b', 'c', 'd'])
+        self.assertEqual(indptr.tolist(), [0, 1, 3, 5, 7])
+        self.assertEqual(indices.tolist(), [1, 0, 2, 1, 3, 2, 3])
+        self.assertEqual(data.tolist(), [3., 3., 1., 1., 2., 2., 1.])
+        indptr, indices, data, nodes = read_edges(io.StringIO('0,2\n2,1,0.5\n'), delimiter=',', integer_nodes=True)
+        self.assertIsNone(nodes)
+        self.assertEqual(indices.tolist(), [2, 2, 0, 1])
+
+        indptr, indices, data, nodes = read_edges(io.StringIO('# no edge\n'))
+        self.assertEqual(indptr.tolist(), [0])
+        self.assertEqual(data.dtype, float)
+
+        with self.assertRaises(ValueError):
+            read_edges(io.StringIO('a\n'))
+
+    def test_labels_from_clustering(self):
+        self.assertEqual(labels_from_clustering([[0, 1], [3]], 4).tolist(), [0, 0, -1, 1])
+        self.assertEqual(labels_from_clustering([2, 3], 4).tolist(), [-1, -1, 0, 0])
+
+    def test_main(self):
+        graph = nx.Graph()
+        graph.add_nodes_from(range(34))
+        graph.add_edges_from(nx.karate_club_graph().edges())
+        directory = tempfile.mkdtemp()
+        path = os.path.join(directory, 'edges.txt')
+        with open(path, 'w') as f:
+            for u, v in graph.edges():
+                f.write('{} {}\n'.format(u, v))
+        output = os.path.join(directory, 'dendrogram.npy')
+        cuts = os.path.join(directory, 'cuts.json')
+        labels = os.path.join(directory, 'labels.tsv')
+        main([path, '-o', output, '--integer-nodes', '--best', 'homogeneous', '--rank', 'cluster', '--top', '2',
+              '--threads', '2', '--cuts', cuts, '--labels', labels, '--quiet'])
+        dendrogram = np.load(output)
+        self.assertTrue(np.array_equal(dendrogram, paris(graph)))
+        with open(cuts) as f:
+            results = json.load(f)
+        self.assertEqual(len(results['ranking']['cluster']['cuts']), 2)
+        with open(labels) as f:
+            self.assertEqual(len(f.readlines()), graph.number_of_nodes() + 1)
+
+        empty = os.path.join(directory, 'empty.txt')
+        with open(empty, 'w') as f:
+            f.write('# no edge\n')
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            main([empty, '-o', output, '--quiet'])
+
+        # A single edge has no cluster cut: its nodes are labeled -1.
+        edge = os.path.join(directory, 'edge.txt')
+        with open(edge, 'w') as f:
+            f.write('0 1\n')
+        main([edge, '-o', output, '--integer-nodes', '--best', 'cluster', '--cuts', cuts, '--labels', labels,
+              '--quiet'])
+        with open(cuts) as f:
+            self.assertEqual(json.load(f)['best']['cluster']['cut'], -1)
+        with open(labels) as f:
+            self.assertEqual(f.read(), 'node\tcluster\n0\t-1\n1\t-1\n')
+
+        # Two components: the infinite distance and scores are written as null.
+        with open(edge, 'w') as f:
+            f.write('0 1\n2 3\n')
+        main([edge, '-o', output, '--integer-nodes', '--best', 'distance', '--rank', 'distance', '--cuts', cuts,
+              '--quiet'])
+        with open(cuts) as f:
+            results = json.load(f)
+        self.assertIsNone(results['best']['distance']['score'])
+        self.assertIn(None, results['ranking']['distance']['cuts'])
+
+        main([path, '-o', output, '--integer-nodes', '--memory-budget', '100000', '--quiet'])
+        self.assertTrue(np.array_equal(np.load(output), dendrogram))
+
+        output = os.path.join(directory, 'dendrogram.pdz')
+        main([path, '-o', output, '--integer-nodes', '--quiet'])
+        self.assertTrue(np.array_equal(load_dendrogram(output), dendrogram))
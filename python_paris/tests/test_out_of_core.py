@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+import unittest
+from python_paris.out_of_core import *
+from python_paris.paris import paris_csr
+
+
+class TestOutOfCore(unittest.TestCase):
+
+    def setUp(self):
+        # A ring of 20 cliques of 5 nodes, plus an isolated edge.
+        edges = []
+        for c in range(20):
+            nodes = range(5 * c, 5 * c + 5)
+            edges += [(u, v) for u in nodes for v in nodes if u < v]
+            edges.append((5 * c, (5 * c + 7) % 100))
+        edges.append((100, 101))
+        rows = np.array([u for u, v in edges] + [v for u, v in edges])
+        cols = np.array([v for u, v in edges] + [u for u, v in edges])
+        order = np.lexsort((cols, rows))
+        self.indices = cols[order]
+        self.indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=102))))
+        self.data = np.ones(len(self.indices))
+        self.directory = tempfile.mkdtemp()
+        save_csr(self.directory, self.indptr, self.indices, self.data)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_load_csr(self):
+        indptr, indices, data = load_csr(self.directory)
+        self.assertTrue(np.array_equal(indptr, self.indptr))
+        self.assertTrue(np.array_equal(indices, self.indices))
+        self.assertTrue(np.array_equal(data, self.data))
+
+    def test_paris_out_of_core(self):
+        dendrogram = paris_csr(self.indptr, self.indices, self.data)
+        self.assertTrue(np.array_equal(paris_out_of_core(self.directory), dendrogram))
+
+        work_directory = os.path.join(self.directory, 'work')
+        dendrogram_path = os.path.join(self.directory, 'dendrogram.npy')
+        out_of_core = paris_out_of_core(self.directory, memory_budget=6000, work_directory=work_directory,
+                                        dendrogram_path=dendrogram_path)
+        self.assertTrue(np.array_equal(out_of_core, dendrogram))
+        self.assertTrue(np.array_equal(np.load(dendrogram_path), dendrogram))
+        self.assertGreater(os.path.getsize(os.path.join(work_directory, 'spill.bin')), 0)
+
+        with self.assertRaises(MemoryError):
+            paris_out_of_core(self.directory, memory_budget=1000)
+
+    def test_self_loops(self):
+        indptr = np.array([0, 4, 5, 7])
+        indices = np.array([0, 1, 1, 2, 0, 0, 2])
+        data = np.array([2., 1., 1., 1., 2., 1., 1.])
+        save_csr(self.directory, indptr, indices, data)
+        dendrogram = paris_csr(indptr, indices, data)
+        self.assertTrue(np.array_equal(paris_out_of_core(self.directory, chunk_size=2), dendrogram))
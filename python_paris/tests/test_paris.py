@@ -1,5 +1,10 @@
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
-import networkx
+import networkx as nx
+import numpy as np
 from python_paris.paris import *
 
 
@@ -19,3 +24,106 @@ class TestParis(unittest.TestCase):
         dendrogram_unweighted = paris(self.unweighted_graph)
 
         self.assertEqual(dendrogram_unweighted.any(), dendrogram_weighted.any())
+
+    def test_paris_csr(self):
+        indptr = np.array([0, 2, 4, 7, 10, 12, 14])
+        indices = np.array([1, 2, 0, 2, 0, 1, 3, 2, 4, 5, 3, 5, 3, 4])
+        data = np.ones(14)
+        dendrogram = paris_csr(indptr, indices, data)
+        self.assertTrue(np.array_equal(dendrogram, paris(self.unweighted_graph)))
+
+        self_loops = np.array([0., 0., 0., 0., 1., 1.])
+        dendrogram_loops = paris_csr(indptr, indices, data, self_loops=self_loops)
+        dendrogram_weights = paris_csr(indptr, indices, data, node_weights=np.array([2., 2., 3., 3., 4., 4.]))
+        self.assertTrue(np.array_equal(dendrogram_loops, dendrogram_weights))
+        self.assertEqual(dendrogram_loops[-1, 3], 6)
+
+        with self.assertRaises(ValueError):
+            paris_csr(indptr, indices, data, node_weights=np.ones(5))
+        with self.assertRaises(ValueError):
+            paris_csr(indptr, indices, data, node_weights=np.ones(6), self_loops=np.ones(6))
+
+    def test_paris_csr_self_loops(self):
+        graph = self.weighted_graph.copy()
+        graph.add_edge(4, 4, weight=3)
+        graph.add_edge(0, 0, weight=1)
+        adjacency = nx.to_scipy_sparse_array(graph, format='csr', dtype=float) \
+            if hasattr(nx, 'to_scipy_sparse_array') else nx.to_scipy_sparse_matrix(graph, format='csr', dtype=float)
+        dendrogram = paris(graph)
+        self.assertTrue(np.array_equal(paris_csr(adjacency.indptr, adjacency.indices, adjacency.data), dendrogram))
+        self.assertTrue(np.array_equal(paris_csr(adjacency.indptr, adjacency.indices, adjacency.data,
+                                                 deterministic=True), paris(graph, deterministic=True)))
+
+        # Repeated entries are summed, in the adjacency as in the node weights.
+        indptr = np.array([0, 3, 4, 6, 7])
+        indices = np.array([1, 1, 2, 0, 0, 3, 2])
+        data = np.array([1., 1., 1., 2., 1., 1., 1.])
+        summed = paris_csr(np.array([0, 2, 3, 5, 6]), np.array([1, 2, 0, 0, 3, 2]), np.array([2., 1., 2., 1., 1., 1.]))
+        self.assertTrue(np.array_equal(paris_csr(indptr, indices, data), summed))
+        self.assertTrue(np.array_equal(paris_csr(indptr, indices, data, deterministic=True)[:, 2:], summed[:, 2:]))
+
+    def test_paris_stats(self):
+        dendrogram, stats = paris(self.weighted_graph, return_stats=True)
+        self.assertTrue(np.array_equal(dendrogram, paris(self.weighted_graph)))
+        self.assertEqual(set(stats.times), {'labels', 'copy', 'weights', 'chain', 'merge', 'join', 'reorder'})
+        self.assertEqual(stats.merges, 5)
+        self.assertEqual(stats.components, 1)
+        self.assertGreaterEqual(stats.chain_steps, 6)
+        self.assertGreaterEqual(stats.neighbor_scans, 14)
+        self.assertGreaterEqual(stats.max_chain_length, 2)
+
+    def test_paris_progress(self):
+        progress = []
+        paris(self.weighted_graph, callback=lambda *args: progress.append(args), callback_interval=2)
+        self.assertEqual([(merges, clusters) for merges, clusters, elapsed in progress], [(2, 4), (4, 2)])
+
+    def test_paris_cancel(self):
+        cancel = CancellationToken()
+
+        def callback(merges, clusters, elapsed):
+            cancel.cancel()
+
+        with self.assertRaises(ParisCancelled) as context:
+            paris(self.weighted_graph, callback=callback, callback_interval=2, cancel=cancel)
+        checkpoint = context.exception.checkpoint
+        self.assertEqual(len(checkpoint.dendrogram), 2)
+
+        path = os.path.join(tempfile.mkdtemp(), 'checkpoint.pkl')
+        save_checkpoint(checkpoint, path)
+        dendrogram = resume_paris(load_checkpoint(path))
+        self.assertTrue(np.array_equal(dendrogram, paris(self.weighted_graph)))
+
+    def test_lazy_imports(self):
+        code = ('import sys, python_paris\n'
+                'from python_paris import paris, best_cluster_cut, to_linkage\n'
+                'assert callable(paris) and "networkx" not in sys.modules\n'
+                'assert "python_paris.out_of_core" not in sys.modules')
+        subprocess.check_call([sys.executable, '-c', code])
+
+    def test_public_api(self):
+        import python_paris
+        for name in python_paris.__all__:
+            self.assertTrue(hasattr(python_paris, name), name)
+        namespace = {}
+        exec('from python_paris.paris import *', namespace)
+        self.assertEqual(set(namespace) - {'__builtins__'}, set(sys.modules['python_paris.paris'].__all__))
+
+    def test_paris_deterministic(self):
+        graph = nx.cycle_graph(8)
+        for u, v in graph.edges():
+            graph[u][v]['weight'] = [0.1, 0.2, 0.3][(u + v) % 3]
+        shuffled = nx.Graph()
+        shuffled.add_nodes_from(range(8))
+        shuffled.add_edges_from(reversed(list(graph.edges(data=True))))
+        dendrogram = paris(graph, deterministic=True)
+        self.assertTrue(np.array_equal(paris(shuffled, deterministic=True), dendrogram))
+        adjacency = nx.to_scipy_sparse_array(graph, format='csr', dtype=float) \
+            if hasattr(nx, 'to_scipy_sparse_array') else nx.to_scipy_sparse_matrix(graph, format='csr', dtype=float)
+        self.assertTrue(np.array_equal(paris_csr(adjacency.indptr, adjacency.indices, adjacency.data,
+                                                 deterministic=True), dendrogram))
+        self.assertTrue(np.array_equal(paris(self.unweighted_graph, deterministic=True)[:, 2:],
+                                       paris(self.unweighted_graph)[:, 2:]))
+
+        with self.assertRaises(ValueError):
+            paris(graph, deterministic=True, cancel=CancellationToken())
+
@@ -0,0 +1,32 @@
+import unittest
+from python_paris.projection import *
+from python_paris.homogeneous_cut_slicer import best_homogeneous_cut
+
+
+class TestProjection(unittest.TestCase):
+
+    def setUp(self):
+            self.dendrogram = np.array([[0, 1, 1., 2],
+                                        [2, 3, 2., 2],
+                                        [4, 5, 4., 4]])
+
+    def test_project_dendrogram(self):
+        projected, nodes = project_dendrogram(self.dendrogram, [3, 0, 1])
+        self.assertEqual(nodes.tolist(), [0, 1, 3])
+        self.assertEqual(projected.tolist(), [[0, 1, 1., 2], [3, 2, 4., 3]])
+        projected, nodes = project_dendrogram(self.dendrogram, [1, 3, 3])
+        self.assertEqual(projected.tolist(), [[0, 1, 4., 2]])
+        projected, nodes = project_dendrogram(self.dendrogram, [2])
+        self.assertEqual(np.shape(projected), (0, 4))
+        best_homogeneous_cut(project_dendrogram(self.dendrogram, [0, 2, 3])[0])
+
+        with self.assertRaises(ValueError):
+            project_dendrogram(self.dendrogram, [4])
+
+    def test_projector(self):
+        projector = DendrogramProjector(self.dendrogram)
+        projected, nodes, merges = projector.project([0, 1, 2, 3])
+        self.assertTrue(np.array_equal(projected, self.dendrogram))
+        projected, nodes, merges = projector.project([0, 2, 3])
+        self.assertEqual(merges.tolist(), [1, 2])
+        self.assertEqual(projected.tolist(), [[1, 2, 2., 2], [0, 3, 4., 3]])
@@ -0,0 +1,31 @@
+import unittest
+from python_paris.resolution_slicer import *
+
+
+class TestResolutionSlicer(unittest.TestCase):
+
+    def setUp(self):
+            self.dendrogram = np.array([[0, 1, 1., 2],
+                                        [2, 3, 2., 2],
+                                        [4, 5, 4., 4]])
+            self.indptr = np.array([0, 1, 3, 5, 6])
+            self.indices = np.array([1, 0, 2, 1, 3, 2])
+            self.data = np.array([2., 2., 1., 1., 2., 2.])
+
+    def test_clusterings_from_resolutions(self):
+        labels = clusterings_from_resolutions(self.dendrogram, [0., 1.5, 3., 5.])
+        self.assertEqual(labels.tolist(), [[0, 1, 2, 3], [4, 4, 2, 3], [4, 4, 5, 5], [6, 6, 6, 6]])
+
+        with self.assertRaises(ValueError):
+            clusterings_from_resolutions(self.dendrogram, [-1.])
+
+    def test_modularity_from_resolutions(self):
+        modularities = modularity_from_resolutions(self.dendrogram, self.indptr, self.indices, self.data, [0., 1., 3.])
+        self.assertAlmostEqual(modularities[0], - 2 * (2. / 10) ** 2 - 2 * (3. / 10) ** 2)
+        self.assertAlmostEqual(modularities[1], 4. / 10 - (5. / 10) ** 2 - (3. / 10) ** 2 - (2. / 10) ** 2)
+        self.assertAlmostEqual(modularities[2], 3 * 8. / 10 - 2 * (5. / 10) ** 2)
+
+    def test_resolution_sweep(self):
+        labels, modularities = resolution_sweep(self.dendrogram, self.indptr, self.indices, self.data, [3.])
+        self.assertEqual(labels.tolist(), [[4, 4, 5, 5]])
+        self.assertAlmostEqual(modularities[0], 3 * 8. / 10 - 2 * (5. / 10) ** 2)
@@ -0,0 +1,45 @@
+import unittest
+import networkx as nx
+from python_paris.sampling import *
+from python_paris.paris import paris
+
+
+class TestSampling(unittest.TestCase):
+
+    def setUp(self):
+            self.graph = nx.karate_club_graph()
+            self.edges = [(u, v) for u, v in self.graph.edges()]
+
+    def test_full_sample(self):
+        dendrogram, distance_errors, nodes = paris_from_stream(self.edges, sample_size=len(self.edges))
+        index = {node: i for i, node in enumerate(nodes)}
+        graph = nx.Graph()
+        graph.add_nodes_from(range(len(nodes)))
+        graph.add_edges_from((index[u], index[v]) for u, v in self.edges)
+        self.assertTrue(np.array_equal(dendrogram, paris(graph)))
+        self.assertEqual(np.shape(distance_errors), (len(nodes) - 1,))
+        self.assertTrue(np.all(distance_errors > 0))
+
+    def test_reservoir(self):
+        reservoir = EdgeReservoir(sample_size=20, seed=0)
+        reservoir.update(self.edges)
+        self.assertEqual(reservoir.n_sampled, 20)
+        self.assertEqual(reservoir.n_events, len(self.edges))
+        indptr, indices, data, counts = reservoir.adjacency()
+        self.assertEqual(np.sum(counts), 40)
+        self.assertAlmostEqual(np.sum(data), 2 * len(self.edges))
+        self.assertEqual(EdgeReservoir(max_memory=100 * EDGE_BYTES).sample_size, 100)
+        indptr, indices, data, counts = EdgeReservoir(sample_size=20).adjacency()
+        self.assertEqual((indptr.tolist(), len(indices), data.dtype), ([0], 0, float))
+
+        with self.assertRaises(ValueError):
+            EdgeReservoir(sample_size=0)
+
+    def test_sampled_paris(self):
+        dendrogram, distance_errors, nodes = paris_from_stream(self.edges, sample_size=40, seed=0,
+                                                               exact_node_weights=False)
+        self.assertEqual(np.shape(dendrogram), (len(nodes) - 1, 4))
+        self.assertEqual(dendrogram[-1, 3], len(nodes))
+        distances = dendrogram[:, 2]
+        self.assertTrue(np.all(np.diff(distances[np.isfinite(distances)]) >= 0))
+        self.assertTrue(np.all(np.isinf(distance_errors[np.isinf(distances)])))
@@ -0,0 +1,113 @@
+import asyncio
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from python_paris.server import *
+
+
+class TestServer(unittest.TestCase):
+
+    def setUp(self):
+            self.dendrogram = np.array([[0, 1, 1., 2],
+                                        [2, 3, 2., 2],
+                                        [4, 5, 4., 4]])
+
+    def test_membership(self):
+        self.assertEqual(membership(self.dendrogram, 0, distance=0.), 0)
+        self.assertEqual(membership(self.dendrogram, 1, distance=1.5), 4)
+        self.assertEqual(membership(self.dendrogram, 2, cut=2), 5)
+        self.assertEqual(membership(self.dendrogram, 3, distance=5.), 6)
+
+        with self.assertRaises(ValueError):
+            membership(self.dendrogram, 4, cut=0)
+        with self.assertRaises(ValueError):
+            membership(self.dendrogram, 0, cut=4)
+
+        index = MembershipIndex(self.dendrogram)
+        self.assertEqual([index.cluster(node, distance=3.) for node in range(4)], [4, 4, 5, 5])
+        self.assertEqual(index.cluster(3, cut=3), 6)
+
+        # A path dendrogram: each node is merged with the cluster of the previous nodes.
+        n = 100
+        path = np.array([[0 if t == 0 else n + t - 1, t + 1, t + 1., t + 2] for t in range(n - 1)])
+        index = MembershipIndex(path)
+        self.assertLessEqual(len(index.ancestors), 8)
+        self.assertEqual([index.cluster(0, cut=cut) for cut in [0, 1, 50, 99]], [0, n, n + 49, n + 98])
+        self.assertEqual([index.cluster(node, cut=50) for node in [50, 51, 99]], [n + 49, 51, 99])
+
+    def test_local_client(self):
+        server = DendrogramServer({'simple': self.dendrogram}, max_workers=2)
+        client = LocalClient(server)
+
+        async def run():
+            return await asyncio.gather(client.query(dendrogram='simple', query='distance', distance=3.),
+                                        client.query(dendrogram='simple', query='distance', distance=3.),
+                                        client.query(dendrogram='simple', query='membership', node=2, cut=2),
+                                        client.query(dendrogram='simple', query='best_heterogeneous'),
+                                        client.query(dendrogram='simple', query='ranking_homogeneous', k=2))
+
+        results = asyncio.run(run())
+        server.close()
+        self.assertEqual(results[0], [[0, 1], [2, 3]])
+        self.assertEqual(results[1], [[0, 1], [2, 3]])
+        self.assertEqual(results[2], 5)
+        self.assertEqual(results[3][0], [4, 5])
+        self.assertEqual(results[4][0], [2, 1])
+        self.assertEqual(server.computations, 4)
+
+    def test_process_pool(self):
+        executor = ProcessPoolExecutor(max_workers=1)
+        server = DendrogramServer({'simple': self.dendrogram}, executor=executor)
+        client = LocalClient(server)
+
+        async def run():
+            return await asyncio.gather(client.query(dendrogram='simple', query='distance', distance=3.),
+                                        client.query(dendrogram='simple', query='membership', node=2, cut=2))
+
+        results = asyncio.run(run())
+        server.close()
+        self.assertEqual(results, [[[0, 1], [2, 3]], 5])
+
+    def test_tcp_client(self):
+        components = np.array([[0, 1, 1., 2], [2, 3, 2., 2], [4, 5, np.inf, 4]])
+        server = DendrogramServer({'simple': self.dendrogram, 'components': components})
+
+        async def run():
+            tcp_server = await server.serve(port=0)
+            port = tcp_server.sockets[0].getsockname()[1]
+            client = await DendrogramClient.connect(port=port)
+            results = await asyncio.gather(client.query(dendrogram='simple', query='cluster', cut=5),
+                                           client.query(dendrogram='simple', query='best_cluster'),
+                                           client.query(dendrogram='components', query='ranking_distance'))
+            with self.assertRaises(RuntimeError):
+                await client.query(dendrogram='missing', query='cluster', cut=5)
+            await client.close()
+            tcp_server.close()
+            await tcp_server.wait_closed()
+            return results
+
+        results = asyncio.run(run())
+        server.close()
+        self.assertEqual(results[0], [2, 3])
+        self.assertEqual(results[1][0], 4)
+        # The infinite distance between the components is sent as null.
+        self.assertIn(None, results[2][1])
+
+    def test_tcp_client_closed(self):
+        async def close_after_one_line(reader, writer):
+            await reader.readline()
+            writer.close()
+
+        async def run():
+            tcp_server = await asyncio.start_server(close_after_one_line, '127.0.0.1', 0)
+            port = tcp_server.sockets[0].getsockname()[1]
+            client = await DendrogramClient.connect(port=port)
+            results = await asyncio.gather(client.query(dendrogram='simple', query='best_cluster'),
+                                           client.query(dendrogram='simple', query='best_distance'),
+                                           return_exceptions=True)
+            await client.close()
+            tcp_server.close()
+            await tcp_server.wait_closed()
+            return results
+
+        results = asyncio.run(asyncio.wait_for(run(), 5))
+        self.assertTrue(all(isinstance(result, ConnectionError) for result in results))
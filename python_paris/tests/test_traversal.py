@@ -0,0 +1,40 @@
+import unittest
+from python_paris.traversal import *
+from python_paris.cluster_cut_slicer import ClusterTree
+
+
+class TestTraversal(unittest.TestCase):
+
+    def setUp(self):
+            self.dendrogram = np.array([[0, 1, 1., 2],
+                                        [2, 3, 2., 2],
+                                        [4, 5, 4., 4]])
+
+    def test_preorder_postorder(self):
+        self.assertEqual(list(preorder(self.dendrogram)), [6, 4, 0, 1, 5, 2, 3])
+        self.assertEqual(list(postorder(self.dendrogram)), [0, 1, 4, 2, 3, 5, 6])
+        self.assertEqual(list(preorder(self.dendrogram, 5)), [5, 2, 3])
+        self.assertEqual(list(postorder(self.dendrogram, 1)), [1])
+
+        with self.assertRaises(ValueError):
+            list(preorder(self.dendrogram, 7))
+
+    def test_leaves(self):
+        self.assertEqual(list(leaves(self.dendrogram, 5)), [2, 3])
+        self.assertEqual(list(leaves(self.dendrogram)), [0, 1, 2, 3])
+
+        n_nodes = 10000
+        chain = np.array([[0 if t == 0 else n_nodes + t - 1, t + 1, t + 1., t + 2] for t in range(n_nodes - 1)])
+        self.assertEqual(sum(1 for _ in leaves(chain)), n_nodes)
+        index = LeafIndex(chain)
+        self.assertEqual(index.leaves(2 * n_nodes - 2).tolist(), list(range(n_nodes)))
+        self.assertEqual([len(chunk) for chunk in index.iter_leaves(n_nodes + 4, chunk_size=4)], [4, 2])
+
+    def test_tree_traversal(self):
+        root = ClusterTree(6, 4., 4)
+        root.left = ClusterTree(4, 1., 2)
+        root.right = ClusterTree(2, 0., 1)
+        root.left.left = ClusterTree(0, 0., 1)
+        root.left.right = ClusterTree(1, 0., 1)
+        self.assertEqual([t.cluster_label for t in tree_preorder(root)], [6, 4, 0, 1, 2])
+        self.assertEqual([t.cluster_label for t in tree_postorder(root)], [0, 1, 4, 2, 6])
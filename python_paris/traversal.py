@@ -0,0 +1,163 @@
+import numpy as np
+from .dendrogram_utils import cluster_sizes, leaf_order
+
+
+def _children(dendrogram, node, n_nodes):
+    row = dendrogram[node - n_nodes]
+    return int(row[0]), int(row[1])
+
+
+def _check_cluster(n_nodes, cluster):
+    if cluster is None:
+        return 2 * n_nodes - 2
+    if cluster < 0 or cluster > 2 * n_nodes - 2:
+        raise ValueError
+    return cluster
+
+
+def preorder(dendrogram, cluster=None):
+    """
+     Given a dendrogram, iterate over the clusters of a subtree in pre-order (parent, left subtree, right subtree),
+     with an explicit stack.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     cluster: int
+         Cluster cut level of the root of the subtree, from 0 to 2*n - 2. By default, the root of the dendrogram.
+
+     Returns
+     -------
+     clusters: generator of int
+         The cluster cut levels of the subtree. The n first cut levels are the sole nodes, the cut level n+t is the
+         cluster created after t merges.
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    stack = [_check_cluster(n_nodes, cluster)]
+    while stack:
+        node = stack.pop()
+        yield node
+        if node >= n_nodes:
+            left, right = _children(dendrogram, node, n_nodes)
+            stack.append(right)
+            stack.append(left)
+
+
+def postorder(dendrogram, cluster=None):
+    """
+     Given a dendrogram, iterate over the clusters of a subtree in post-order (left subtree, right subtree, parent),
+     with an explicit stack.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     cluster: int
+         Cluster cut level of the root of the subtree, from 0 to 2*n - 2. By default, the root of the dendrogram.
+
+     Returns
+     -------
+     clusters: generator of int
+         The cluster cut levels of the subtree.
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    stack = [(_check_cluster(n_nodes, cluster), False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded or node < n_nodes:
+            yield node
+        else:
+            left, right = _children(dendrogram, node, n_nodes)
+            stack.append((node, True))
+            stack.append((right, False))
+            stack.append((left, False))
+
+
+def leaves(dendrogram, cluster=None):
+    """
+     Given a dendrogram, iterate over the nodes of a cluster, with an explicit stack.
+
+     Parameters
+     ----------
+     dendrogram: numpy.array
+         Each line of the dendrogram contains the merged nodes, the distance between merged nodes and the number of
+         nodes in the new cluster.
+     cluster: int
+         Cluster cut level of the cluster, e.g. the best cut of best_cluster_cut. By default, the root of the
+         dendrogram.
+
+     Returns
+     -------
+     nodes: generator of int
+         The nodes of the cluster, in the order of the leaves of the dendrogram.
+     """
+    n_nodes = np.shape(dendrogram)[0] + 1
+    for node in preorder(dendrogram, cluster):
+        if node < n_nodes:
+            yield node
+
+
+class LeafIndex:
+    """
+     Precomputed order of the nodes of a dendrogram in which every cluster is a contiguous block, so that the nodes of
+     any cluster are available in O(1) time as a view, without walking the tree.
+     """
+    def __init__(self, dendrogram):
+        self.n_nodes = np.shape(dendrogram)[0] + 1
+        self.order, self.offsets = leaf_order(dendrogram)
+        self.sizes = cluster_sizes(dendrogram)
+
+    def leaves(self, cluster):
+        """
+         Nodes of a cluster, as a read-only view of the leaf order.
+         """
+        cluster = _check_cluster(self.n_nodes, cluster)
+        view = self.order[self.offsets[cluster]:self.offsets[cluster] + self.sizes[cluster]]
+        view.flags.writeable = False
+        return view
+
+    def iter_leaves(self, cluster, chunk_size=65536):
+        """
+         Iterate over the nodes of a cluster by chunks of at most chunk_size nodes.
+         """
+        cluster = _check_cluster(self.n_nodes, cluster)
+        start = self.offsets[cluster]
+        end = start + self.sizes[cluster]
+        for i in range(start, end, chunk_size):
+            chunk = self.order[i:min(i + chunk_size, end)]
+            chunk.flags.writeable = False
+            yield chunk
+
+
+def tree_preorder(tree):
+    """
+     Iterate in pre-order over a linked ClusterTree (objects with left and right attributes), with an explicit stack.
+     """
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        yield node
+        if node.right is not None:
+            stack.append(node.right)
+        if node.left is not None:
+            stack.append(node.left)
+
+
+def tree_postorder(tree):
+    """
+     Iterate in post-order over a linked ClusterTree (objects with left and right attributes), with an explicit stack.
+     """
+    stack = [(tree, False)]
+    while stack:
+        node, expanded = stack.pop()
+        if expanded or (node.left is None and node.right is None):
+            yield node
+        else:
+            stack.append((node, True))
+            if node.right is not None:
+                stack.append((node.right, False))
+            if node.left is not None:
+                stack.append((node.left, False))